@@ -1,9 +1,34 @@
+import json
 import re
+from functools import lru_cache
+from typing import Any
 
+try:
+    import orjson
+except ImportError:  # optional speedup; the stdlib decoder is the fallback
+    orjson = None
 
+_SAINT_RE = re.compile(r"\bSt\.\s+")
+
+# Plain decimal/exponent numbers; screening with this lets callers convert
+# with float() without wrapping every cell in try/except
+NUMERIC_RE = re.compile(r"[-+]?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?")
+
+
+@lru_cache(maxsize=512)
 def clean_county_name(name: str) -> str:
     """Normalize a county name: strip state/county suffixes, spell out 'Saint'."""
-    name = name.replace(", Michigan", "")
-    name = re.sub(r"\s+County$", "", name)
-    name = re.sub(r"\bSt\.\s+", "Saint ", name)
+    name = name.removesuffix(", Michigan")
+    if name.endswith("County") and name[-7:-6].isspace():
+        name = name[:-6].rstrip()
+    # Slow path: only names that actually contain "St." pay for the regex
+    if "St." in name:
+        name = _SAINT_RE.sub("Saint ", name)
     return name
+
+
+def load_json(content: bytes) -> Any:
+    """Decode a JSON response body, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.loads(content)
+    return json.loads(content)
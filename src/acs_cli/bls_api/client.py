@@ -8,7 +8,9 @@ from pathlib import Path
 
 import httpx
 
-from acs_cli.hrsa_api.client import MI_FIPS_TO_COUNTY
+from acs_cli import load_json
+from acs_cli.hrsa_api.client import MI_COUNTY_FIPS
+from acs_cli.tabular import write_measure_csv
 
 # ── Constants ────────────────────────────────────────────────────────────────
 
@@ -206,14 +208,12 @@ def fetch_economy_data(
     Builds series IDs for each county × measure combination,
     batches into chunks of 50 (BLS limit), and reassembles by county.
     """
-    fips_list = sorted(MI_FIPS_TO_COUNTY.keys())
-
-    # Build all series IDs and track mapping: series_id -> (fips, measure)
+    # Build all series IDs and track mapping: series_id -> (county, measure)
     series_map: dict[str, tuple[str, EconomyMeasure]] = {}
-    for fips in fips_list:
+    for fips, county in MI_COUNTY_FIPS:
         for m in measures:
             sid = _build_series_id(fips, m.series_code)
-            series_map[sid] = (fips, m)
+            series_map[sid] = (county, m)
 
     all_series = list(series_map.keys())
     chunks = [
@@ -224,49 +224,48 @@ def fetch_economy_data(
     # Accumulate results by county
     by_county: dict[str, dict] = {}
 
-    for chunk in chunks:
-        payload = {
-            "seriesid": chunk,
-            "startyear": str(year),
-            "endyear": str(year),
-            "registrationkey": api_key,
-        }
-        resp = httpx.post(BLS_BASE_URL, json=payload, timeout=30)
-        if resp.status_code != 200:
-            raise BLSAPIError(resp.status_code, resp.text[:200])
-
-        data = resp.json()
-        if data.get("status") != "REQUEST_SUCCEEDED":
-            msg = "; ".join(data.get("message", []))
-            raise BLSAPIError(resp.status_code, msg or "Request failed")
-
-        for series in data.get("Results", {}).get("series", []):
-            sid = series.get("seriesID", "")
-            if sid not in series_map:
-                continue
-            fips, measure = series_map[sid]
-            county = MI_FIPS_TO_COUNTY.get(fips, "")
-            if not county:
-                continue
-
-            if county not in by_county:
-                by_county[county] = {"county": county}
-
-            # Find the matching period; fall back to latest month if
-            # the requested period (e.g. M13 annual avg) isn't available.
-            year_data = [
-                dp for dp in series.get("data", [])
-                if dp.get("year") == str(year)
-            ]
-            match = next(
-                (dp for dp in year_data if dp.get("period") == period),
-                None,
-            )
-            if match is None and year_data:
-                # Pick the latest month (highest period string)
-                match = max(year_data, key=lambda dp: dp.get("period", ""))
-            if match:
-                by_county[county][measure.measure_id] = match.get("value", "")
+    # One pooled client so every chunk reuses the same connection
+    with httpx.Client(timeout=30) as client:
+        for chunk in chunks:
+            payload = {
+                "seriesid": chunk,
+                "startyear": str(year),
+                "endyear": str(year),
+                "registrationkey": api_key,
+            }
+            resp = client.post(BLS_BASE_URL, json=payload)
+            if resp.status_code != 200:
+                raise BLSAPIError(resp.status_code, resp.text[:200])
+
+            data = load_json(resp.content)
+            if data.get("status") != "REQUEST_SUCCEEDED":
+                msg = "; ".join(data.get("message", []))
+                raise BLSAPIError(resp.status_code, msg or "Request failed")
+
+            for series in data.get("Results", {}).get("series", []):
+                sid = series.get("seriesID", "")
+                if sid not in series_map:
+                    continue
+                county, measure = series_map[sid]
+
+                if county not in by_county:
+                    by_county[county] = {"county": county}
+
+                # Find the matching period; fall back to latest month if
+                # the requested period (e.g. M13 annual avg) isn't available.
+                year_data = [
+                    dp for dp in series.get("data", [])
+                    if dp.get("year") == str(year)
+                ]
+                match = next(
+                    (dp for dp in year_data if dp.get("period") == period),
+                    None,
+                )
+                if match is None and year_data:
+                    # Pick the latest month (highest period string)
+                    match = max(year_data, key=lambda dp: dp.get("period", ""))
+                if match:
+                    by_county[county][measure.measure_id] = match.get("value", "")
 
     return sorted(by_county.values(), key=lambda r: r.get("county", ""))
 
@@ -282,34 +281,14 @@ def write_economy_csv(
     sort_col: str | None = None,
     header: bool = True,
 ) -> int:
-    if county_filter:
-        filt = county_filter.lower()
-        rows = [r for r in rows if filt in r.get("county", "").lower()]
-
-    if not rows:
-        return 0
-
-    if sort_col:
-        target_id = None
-        for m in measures:
-            if m.label.lower() == sort_col.lower():
-                target_id = m.measure_id
-                break
-        if target_id is None:
-            target_id = sort_col
-        rows.sort(key=lambda r: float(r.get(target_id, 0) or 0), reverse=True)
-
-    if header:
-        columns = ["County"] + [m.label for m in measures]
-        writer.writerow(columns)
-
-    for row in rows:
-        csv_row = [row.get("county", "")]
-        for m in measures:
-            csv_row.append(row.get(m.measure_id, ""))
-        writer.writerow(csv_row)
-
-    return len(rows)
+    return write_measure_csv(
+        rows,
+        measures,
+        writer,
+        county_filter=county_filter,
+        sort_col=sort_col,
+        header=header,
+    )
 
 
 # ── QCEW resolve measures ─────────────────────────────────────────────────
@@ -341,8 +320,6 @@ def fetch_qcew_data(
     One GET request per county. Filters CSV rows by (own_code, industry_code,
     agglvl_code) and extracts the named csv_column for each measure.
     """
-    fips_list = sorted(MI_FIPS_TO_COUNTY.keys())
-
     # Build lookup: (own_code, industry_code, agglvl_code) -> list of measures
     filter_map: dict[tuple[str, str, str], list[QCEWMeasure]] = {}
     for m in measures:
@@ -351,32 +328,30 @@ def fetch_qcew_data(
 
     results: list[dict] = []
 
-    for fips in fips_list:
-        county = MI_FIPS_TO_COUNTY.get(fips, "")
-        if not county:
-            continue
-
-        row_data: dict[str, str] = {"county": county}
-
-        url = QCEW_BASE_URL.format(year=year, fips=fips)
-        try:
-            resp = httpx.get(url, timeout=30)
-            if resp.status_code == 200:
-                reader = csv.DictReader(io.StringIO(resp.text))
-                for csv_row in reader:
-                    own = csv_row.get("own_code", "").strip()
-                    ind = csv_row.get("industry_code", "").strip()
-                    agg = csv_row.get("agglvl_code", "").strip()
-                    key = (own, ind, agg)
-                    if key in filter_map:
-                        for m in filter_map[key]:
-                            val = csv_row.get(m.csv_column, "").strip()
-                            if val:
-                                row_data[m.measure_id] = val
-        except (httpx.TimeoutException, httpx.HTTPError):
-            pass
-
-        results.append(row_data)
+    # One pooled client so the per-county requests reuse the same connection
+    with httpx.Client(timeout=30) as client:
+        for fips, county in MI_COUNTY_FIPS:
+            row_data: dict[str, str] = {"county": county}
+
+            url = QCEW_BASE_URL.format(year=year, fips=fips)
+            try:
+                resp = client.get(url)
+                if resp.status_code == 200:
+                    reader = csv.DictReader(io.StringIO(resp.text))
+                    for csv_row in reader:
+                        own = csv_row.get("own_code", "").strip()
+                        ind = csv_row.get("industry_code", "").strip()
+                        agg = csv_row.get("agglvl_code", "").strip()
+                        key = (own, ind, agg)
+                        if key in filter_map:
+                            for m in filter_map[key]:
+                                val = csv_row.get(m.csv_column, "").strip()
+                                if val:
+                                    row_data[m.measure_id] = val
+            except (httpx.TimeoutException, httpx.HTTPError):
+                pass
+
+            results.append(row_data)
 
     return sorted(results, key=lambda r: r.get("county", ""))
 
@@ -392,31 +367,11 @@ def write_qcew_csv(
     sort_col: str | None = None,
     header: bool = True,
 ) -> int:
-    if county_filter:
-        filt = county_filter.lower()
-        rows = [r for r in rows if filt in r.get("county", "").lower()]
-
-    if not rows:
-        return 0
-
-    if sort_col:
-        target_id = None
-        for m in measures:
-            if m.label.lower() == sort_col.lower():
-                target_id = m.measure_id
-                break
-        if target_id is None:
-            target_id = sort_col
-        rows.sort(key=lambda r: float(r.get(target_id, 0) or 0), reverse=True)
-
-    if header:
-        columns = ["County"] + [m.label for m in measures]
-        writer.writerow(columns)
-
-    for row in rows:
-        csv_row = [row.get("county", "")]
-        for m in measures:
-            csv_row.append(row.get(m.measure_id, ""))
-        writer.writerow(csv_row)
-
-    return len(rows)
+    return write_measure_csv(
+        rows,
+        measures,
+        writer,
+        county_filter=county_filter,
+        sort_col=sort_col,
+        header=header,
+    )
@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+import hashlib
+import os
+import tempfile
+import time
+from pathlib import Path
+
+# ── Constants ────────────────────────────────────────────────────────────────
+
+CACHE_DIR = Path.home() / ".cache" / "acs-cli"
+CACHE_TTL_SECONDS = 24 * 60 * 60
+NO_CACHE_ENV = "ACS_CLI_NO_CACHE"
+
+# Credentials don't change the response body, so they stay out of the key
+_UNKEYED_PARAMS = frozenset({"key", "registrationkey"})
+
+
+# ── Response cache ───────────────────────────────────────────────────────────
+#
+# Raw response bodies are stored one file per request, named by a hash of the
+# URL and query params. Caching is best-effort: any filesystem error is a miss.
+
+
+def _enabled() -> bool:
+    return not os.environ.get(NO_CACHE_ENV)
+
+
+def cache_path(url: str, params: dict) -> Path:
+    items = sorted((k, str(v)) for k, v in params.items() if k not in _UNKEYED_PARAMS)
+    digest = hashlib.blake2b(repr((url, items)).encode(), digest_size=16).hexdigest()
+    return CACHE_DIR / f"{digest}.json"
+
+
+def read_cached(url: str, params: dict) -> bytes | None:
+    """Return a cached response body younger than the TTL, else None."""
+    if not _enabled():
+        return None
+    path = cache_path(url, params)
+    try:
+        if time.time() - path.stat().st_mtime > CACHE_TTL_SECONDS:
+            return None
+        return path.read_bytes()
+    except OSError:
+        return None
+
+
+def write_cached(url: str, params: dict, content: bytes) -> None:
+    """Store a response body, replacing any previous entry atomically."""
+    if not _enabled():
+        return
+    path = cache_path(url, params)
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(content)
+            os.replace(tmp, path)
+        except OSError:
+            os.unlink(tmp)
+            raise
+    except OSError:
+        pass
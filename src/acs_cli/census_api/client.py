@@ -1,15 +1,22 @@
 from __future__ import annotations
 
+import asyncio
 import csv
+import math
 import os
 import sys
+from collections.abc import Callable
+from datetime import date
+from functools import lru_cache
 from pathlib import Path
 
 import httpx
+import numpy as np
 from dotenv import load_dotenv
 
-from acs_cli import clean_county_name
-from acs_cli.census_api.zcta import MI_ZCTAS, ZCTA_GEO_BATCH_SIZE
+from acs_cli import NUMERIC_RE, clean_county_name, load_json
+from acs_cli.cache import read_cached, write_cached
+from acs_cli.census_api.zcta import MI_ZCTAS, zcta_batches
 from acs_cli.topics import TOPICS, Variable
 
 load_dotenv()
@@ -19,11 +26,20 @@ load_dotenv()
 ACS_BASE_URL = "https://api.census.gov/data/{year}/acs/acs5"
 MICHIGAN_FIPS = "26"
 DEFAULT_YEAR = 2024
+MIN_YEAR = 2009  # first ACS 5-year vintage
 CONFIG_DIR = Path.home() / ".config" / "acs-cli"
 CONFIG_FILE = CONFIG_DIR / "config"
 MAX_VARS_PER_CALL = 49  # Census API allows 50 fields; NAME takes one slot
-SUPPRESSED = {"-666666666", "-666666666.0", "null", "-", "None", None}
+MAX_CONCURRENT_REQUESTS = 8
+SUPPRESSED = frozenset({"-666666666", "-666666666.0", "null", "-", "None", None})
 ZCTA_FIELD = "zip code tabulation area"
+NAME_LC = "_name_lc"  # derived column: lowercased NAME, for substring filters
+
+# TOPICS is static, so the flattened "all" variable list is built once
+_ALL_VARIABLES: tuple[Variable, ...] = tuple(v for vs in TOPICS.values() for v in vs)
+
+# Column-oriented ACS result: Census header → one value per geography
+ACSTable = dict[str, list[str | None]]
 
 
 # ── API key management ───────────────────────────────────────────────────────
@@ -68,17 +84,21 @@ class CensusAPIError(Exception):
 
 
 # ── Data fetching ────────────────────────────────────────────────────────────
+#
+# ACS results are kept column-oriented: one list per Census header (NAME,
+# variable codes, geography fields), all the same length, with a geography
+# addressed by its row position.
 
-def _fetch_acs_batch(
+async def _fetch_acs_batch(
+    client: httpx.AsyncClient,
     codes: list[str],
     year: int,
     api_key: str,
     *,
-    zip_mode: bool = False,
     zctas: list[str] | None = None,
-) -> list[dict]:
+) -> ACSTable:
     url = ACS_BASE_URL.format(year=year)
-    if zip_mode and zctas:
+    if zctas:
         params: dict[str, str] = {
             "get": f"NAME,{','.join(codes)}",
             "for": f"{ZCTA_FIELD}:{','.join(zctas)}",
@@ -91,18 +111,106 @@ def _fetch_acs_batch(
             "in": f"state:{MICHIGAN_FIPS}",
             "key": api_key,
         }
-    resp = httpx.get(url, params=params, timeout=30)
-    if resp.status_code in (401, 403):
-        raise InvalidAPIKeyError(
-            "Census API rejected your API key.\n"
-            "Run 'acs-cli login' to update your key.\n"
-            "Get a free key at: https://api.census.gov/data/key_signup.html"
-        )
-    if resp.status_code != 200:
-        raise CensusAPIError(resp.status_code, year)
-    data = resp.json()
-    headers = data[0]
-    return [dict(zip(headers, row)) for row in data[1:]]
+    content = read_cached(url, params)
+    if content is None:
+        resp = await client.get(url, params=params)
+        if resp.status_code in (401, 403):
+            raise InvalidAPIKeyError(
+                "Census API rejected your API key.\n"
+                "Run 'acs-cli login' to update your key.\n"
+                "Get a free key at: https://api.census.gov/data/key_signup.html"
+            )
+        if resp.status_code != 200:
+            raise CensusAPIError(resp.status_code, year)
+        content = resp.content
+        write_cached(url, params, content)
+    data = load_json(content)
+    headers, records = data[0], data[1:]
+    if not records:
+        return {h: [] for h in headers}
+    return {h: list(col) for h, col in zip(headers, zip(*records))}
+
+
+def _geo_keys(table: ACSTable, zip_mode: bool) -> list[str]:
+    if zip_mode:
+        return table[ZCTA_FIELD]
+    return [state + county for state, county in zip(table["state"], table["county"])]
+
+
+def _merge_columns(target: ACSTable, index: dict[str, int], batch: ACSTable, keys: list[str]) -> None:
+    """Merge ``batch`` columns into ``target``, aligning rows on geography key."""
+    # Census returns geographies in a stable order, so the first batch fixes
+    # the row order and later batches for the same geographies line up as-is.
+    if not target and len(set(keys)) == len(keys):
+        index.update(zip(keys, range(len(keys))))
+        target.update(batch)
+        return
+    if len(keys) == len(index) and keys == list(index):
+        target.update(batch)
+        return
+
+    positions: list[int] = []
+    for key in keys:
+        pos = index.get(key)
+        if pos is None:
+            pos = index[key] = len(index)
+        positions.append(pos)
+
+    n = len(index)
+    for col in target.values():
+        if len(col) < n:
+            col.extend([None] * (n - len(col)))
+    for header, values in batch.items():
+        if header not in target:
+            target[header] = [None] * n
+        dest = target[header]
+        for pos, value in zip(positions, values):
+            dest[pos] = value
+
+
+async def _fetch_years(
+    variables: list[Variable],
+    years: tuple[int, ...] | list[int],
+    api_key: str,
+    *,
+    zip_mode: bool = False,
+) -> list[ACSTable]:
+    """Fetch every (year, variable chunk, geo batch) request concurrently.
+
+    Returns one merged table per year, in the order of ``years``.
+    """
+    all_codes = [v.code for v in variables]
+    var_chunks = [all_codes[i:i + MAX_VARS_PER_CALL] for i in range(0, len(all_codes), MAX_VARS_PER_CALL)]
+    geo_batches: list[list[str] | None] = zcta_batches(MI_ZCTAS) if zip_mode else [None]
+
+    jobs = [(year, chunk, zctas) for year in years for chunk in var_chunks for zctas in geo_batches]
+    # Bound in-flight requests, not just connections: otherwise every job
+    # queues on the pool at once and the slow tail hits the pool timeout
+    sem = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+
+    async def _bounded(client: httpx.AsyncClient, year: int, chunk: list[str], zctas: list[str] | None) -> ACSTable:
+        async with sem:
+            return await _fetch_acs_batch(client, chunk, year, api_key, zctas=zctas)
+
+    limits = httpx.Limits(max_connections=MAX_CONCURRENT_REQUESTS, max_keepalive_connections=MAX_CONCURRENT_REQUESTS)
+    async with httpx.AsyncClient(timeout=30, limits=limits) as client:
+        # A TaskGroup cancels the outstanding requests as soon as one fails
+        try:
+            async with asyncio.TaskGroup() as tg:
+                tasks = [tg.create_task(_bounded(client, *job)) for job in jobs]
+        except ExceptionGroup as eg:
+            raise eg.exceptions[0] from None
+    results = [task.result() for task in tasks]
+
+    # Merge variable chunks / geo batches into one table per year
+    tables: dict[int, ACSTable] = {year: {} for year in years}
+    indexes: dict[int, dict[str, int]] = {year: {} for year in years}
+    for (year, _, _), batch in zip(jobs, results):
+        _merge_columns(tables[year], indexes[year], batch, _geo_keys(batch, zip_mode))
+    # Lowercase names once here rather than on every filter scan
+    for table in tables.values():
+        table[NAME_LC] = [(name or "").lower() for name in table.get("NAME", ())]
+    return [tables[year] for year in years]
 
 
 def fetch_acs_data(
@@ -111,69 +219,61 @@ def fetch_acs_data(
     api_key: str,
     *,
     zip_mode: bool = False,
-) -> list[dict]:
-    all_codes = [v.code for v in variables]
-    var_chunks = [all_codes[i:i + MAX_VARS_PER_CALL] for i in range(0, len(all_codes), MAX_VARS_PER_CALL)]
-
-    if zip_mode:
-        zcta_list = list(MI_ZCTAS)
-        geo_batches = [zcta_list[i:i + ZCTA_GEO_BATCH_SIZE] for i in range(0, len(zcta_list), ZCTA_GEO_BATCH_SIZE)]
-        merged: dict[str, dict] = {}
-        for chunk in var_chunks:
-            for zcta_batch in geo_batches:
-                batch_rows = _fetch_acs_batch(chunk, year, api_key, zip_mode=True, zctas=zcta_batch)
-                for row in batch_rows:
-                    key = row[ZCTA_FIELD]
-                    if key in merged:
-                        merged[key].update(row)
-                    else:
-                        merged[key] = row
-        return list(merged.values())
-
-    # County mode — single geo query
-    if len(var_chunks) == 1:
-        return _fetch_acs_batch(all_codes, year, api_key)
-    merged = {}
-    for chunk in var_chunks:
-        batch_rows = _fetch_acs_batch(chunk, year, api_key)
-        for row in batch_rows:
-            key = row["state"] + row["county"]
-            if key in merged:
-                merged[key].update(row)
-            else:
-                merged[key] = row
-    return list(merged.values())
+) -> ACSTable:
+    return asyncio.run(_fetch_years(variables, [year], api_key, zip_mode=zip_mode))[0]
 
 
 def fetch_multi_year(
     variables: list[Variable],
-    years: list[int],
+    years: tuple[int, ...] | list[int],
     api_key: str,
     *,
     zip_mode: bool = False,
-) -> list[dict]:
-    combined: list[dict] = []
-    for year in years:
-        rows = fetch_acs_data(variables, year, api_key, zip_mode=zip_mode)
-        for row in rows:
-            row["year"] = str(year)
-        combined.extend(rows)
+) -> ACSTable:
+    per_year = asyncio.run(_fetch_years(variables, years, api_key, zip_mode=zip_mode))
+    combined: ACSTable = {}
+    for year, table in zip(years, per_year):
+        table["year"] = [str(year)] * len(table.get("NAME", ()))
+        for header, col in table.items():
+            combined.setdefault(header, []).extend(col)
     return combined
 
 
 # ── Formatting & output ──────────────────────────────────────────────────────
 
-def format_value(value: str | None, fmt: str) -> str:
-    if value in SUPPRESSED or value is None:
-        return ""
-    try:
-        num = float(value)
-    except (ValueError, TypeError):
-        return str(value)
-    if fmt == "decimal":
-        return f"{num:.1f}"
+def _render_decimal(num: float) -> str:
+    return f"{num:.1f}"
+
+
+def _render_plain(num: float) -> str:
     # number, dollar, percent — return plain numeric value
-    return str(int(num)) if num == int(num) else str(num)
+    return str(int(num)) if num.is_integer() else str(num)
+
+
+@lru_cache(maxsize=None)
+def _make_formatter(fmt: str) -> Callable[[str | None], str]:
+    """Return a formatter specialized for ``fmt`` so per-cell calls skip the branch."""
+    render = _render_decimal if fmt == "decimal" else _render_plain
+
+    def _format(value: str | None) -> str:
+        if value in SUPPRESSED:
+            return ""
+        # Screen out non-numeric text up front instead of raising from float()
+        if isinstance(value, str):
+            if NUMERIC_RE.fullmatch(value) is None:
+                return value
+            return render(float(value))
+        try:
+            num = float(value)
+        except (ValueError, TypeError):
+            return str(value)
+        return render(num)
+
+    return _format
+
+
+def format_value(value: str | None, fmt: str) -> str:
+    return _make_formatter(fmt)(value)
 
 
 def resolve_variables(topics: list[str], raw_variables: list[str] | None) -> list[Variable]:
@@ -183,19 +283,39 @@ def resolve_variables(topics: list[str], raw_variables: list[str] | None) -> lis
             variables.append(Variable(code, code, "number"))
         return variables
 
-    names = topics
-    if "all" in names:
-        names = list(TOPICS.keys())
+    if "all" in topics:
+        return list(_ALL_VARIABLES)
 
-    for name in names:
+    for name in topics:
         if name not in TOPICS:
             raise ValueError(f"Unknown topic '{name}'. Run 'topics' to see available topics.")
         variables.extend(TOPICS[name])
     return variables
 
 
+def parse_years(raw: str) -> tuple[int, ...]:
+    """Parse a comma-separated year list into a sorted, de-duplicated tuple."""
+    try:
+        years = tuple(sorted({int(y) for y in raw.split(",") if y.strip()}))
+    except ValueError:
+        raise ValueError(f"Invalid --years value '{raw}'. Use comma-separated years, e.g. 2019,2023.")
+    if not years:
+        raise ValueError("No years given.")
+    # Sorted, so checking the ends covers every year
+    if years[0] < MIN_YEAR or years[-1] > date.today().year:
+        raise ValueError(f"Years must be between {MIN_YEAR} and {date.today().year}.")
+    return years
+
+
+def _sort_value(value: str | None) -> float:
+    try:
+        return float(value or 0)
+    except ValueError:
+        return math.nan
+
+
 def write_csv(
-    rows: list[dict],
+    table: ACSTable,
     variables: list[Variable],
     writer: csv.writer,
     show_year: bool = False,
@@ -204,32 +324,34 @@ def write_csv(
     header: bool = True,
     zip_mode: bool = False,
 ) -> int:
-    """Write rows as CSV. Returns number of data rows written."""
+    """Write an ACS table as CSV. Returns number of data rows written."""
+    n = len(table.get("NAME", ()))
+    geo = table.get(ZCTA_FIELD if zip_mode else "NAME") or [""] * n
+    years = table.get("year") or [""] * n
+
     # Filter by county name or zip code substring
+    order = list(range(n))
     if county_filter:
         filt = county_filter.lower()
         if zip_mode:
-            rows = [r for r in rows if filt in r.get(ZCTA_FIELD, "").lower()]
+            haystack = geo
         else:
-            rows = [r for r in rows if filt in r.get("NAME", "").lower()]
+            haystack = table.get(NAME_LC) or [(name or "").lower() for name in geo]
+        order = [i for i in order if filt in (haystack[i] or "")]
 
-    if not rows:
+    if not order:
         return 0
 
     # Sort
     if sort_col:
-        target_code = None
-        for v in variables:
-            if v.label.lower() == sort_col.lower():
-                target_code = v.code
-                break
-        if target_code is None:
-            target_code = sort_col
-        rows.sort(key=lambda r: float(r.get(target_code, 0) or 0), reverse=True)
-    elif zip_mode:
-        rows.sort(key=lambda r: (r.get(ZCTA_FIELD, ""), r.get("year", "")))
+        label = sort_col.lower()
+        target_code = next((v.code for v in variables if v.label.lower() == label), sort_col)
+        target = table.get(target_code)
+        if target is not None:
+            keys = np.array([_sort_value(target[i]) for i in order], dtype=np.float64)
+            order = [order[j] for j in np.argsort(-keys, kind="stable")]
     else:
-        rows.sort(key=lambda r: (r.get("NAME", ""), r.get("year", "")))
+        order.sort(key=lambda i: (geo[i] or "", years[i]))
 
     # Build header
     columns: list[str] = []
@@ -242,17 +364,15 @@ def write_csv(
     if header:
         writer.writerow(columns)
 
-    # Build data rows
-    for row in rows:
-        csv_row: list[str] = []
-        if show_year:
-            csv_row.append(row.get("year", ""))
-        if zip_mode:
-            csv_row.append(row.get(ZCTA_FIELD, ""))
-        else:
-            csv_row.append(clean_county_name(row.get("NAME", "")))
-        for v in variables:
-            csv_row.append(format_value(row.get(v.code), v.format))
-        writer.writerow(csv_row)
+    # Stream rows straight into the writer; only the index order is materialized
+    fields = [(table.get(v.code) or [None] * n, _make_formatter(v.format)) for v in variables]
+    geo_name = (lambda g: g or "") if zip_mode else (lambda g: clean_county_name(g or ""))
+
+    def csv_row(i: int) -> list[str]:
+        lead = [years[i], geo_name(geo[i])] if show_year else [geo_name(geo[i])]
+        lead.extend([fmt(col[i]) for col, fmt in fields])
+        return lead
+
+    writer.writerows(map(csv_row, order))
 
-    return len(rows)
+    return len(order)
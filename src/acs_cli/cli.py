@@ -1,11 +1,15 @@
 from __future__ import annotations
 
 import csv
+import re
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional
 
+import httpx
 import typer
 
+from acs_cli import clean_county_name
 from acs_cli.census_api import (
     fetch_acs_data,
     fetch_multi_year,
@@ -17,6 +21,8 @@ from acs_cli.census_api.client import (
     CensusAPIError,
     InvalidAPIKeyError,
     MissingAPIKeyError,
+    NAME_LC,
+    parse_years,
     resolve_variables,
     save_api_key,
     DEFAULT_YEAR,
@@ -60,11 +66,13 @@ from acs_cli.places_api import (
     write_places_csv,
 )
 from acs_cli.places_api.client import DEFAULT_PLACES_YEAR
+from acs_cli.tabular import write_measure_csv
 from acs_cli.topics import TOPICS
 
 app = typer.Typer(help="ACS CLI — Query Census ACS 5-year data for Michigan counties (CSV output).")
 
 ALL_ACCESS_GROUPS = set(ACCESS_MEASURES.keys()) | set(HPSA_MEASURES.keys())
+CSV_BUFFER_SIZE = 1 << 20  # 1 MiB — flush --output files in a few large writes
 
 
 def _get_key() -> str:
@@ -80,6 +88,28 @@ def _handle_api_error(e: CensusAPIError | InvalidAPIKeyError) -> None:
     raise typer.Exit(1)
 
 
+def _handle_request_error(e: httpx.HTTPError) -> None:
+    typer.echo(f"Error: Census API request failed: {str(e) or type(e).__name__}", err=True)
+    raise typer.Exit(1)
+
+
+# Sources abbreviate "Saint" as "St." or "St" (CMS reports "ST JOSEPH")
+_ST_PREFIX_RE = re.compile(r"^st\.?\s+")
+
+
+def _county_key(name: str) -> str:
+    """Lookup key for a county name that is the same across every source."""
+    return _ST_PREFIX_RE.sub("saint ", clean_county_name(name).lower())
+
+
+def _index_by_county(rows: list[dict], field: str = "county") -> dict[str, dict]:
+    """Index source rows by their county lookup key (first row wins)."""
+    index: dict[str, dict] = {}
+    for row in rows:
+        index.setdefault(_county_key(row.get(field, "")), row)
+    return index
+
+
 def _get_bls_key() -> str:
     try:
         return get_bls_api_key()
@@ -119,28 +149,37 @@ def query(
         typer.echo(f"Error: {e}", err=True)
         raise typer.Exit(1)
 
+    year_tuple: tuple[int, ...] = ()
+    if years:
+        try:
+            year_tuple = parse_years(years)
+        except ValueError as e:
+            typer.echo(f"Error: {e}", err=True)
+            raise typer.Exit(1)
+
     show_year = False
     try:
-        if years:
-            year_list = [int(y.strip()) for y in years.split(",")]
-            rows = fetch_multi_year(variables, year_list, api_key, zip_mode=zip_code)
+        if year_tuple:
+            table = fetch_multi_year(variables, year_tuple, api_key, zip_mode=zip_code)
             show_year = True
         else:
-            rows = fetch_acs_data(variables, year, api_key, zip_mode=zip_code)
+            table = fetch_acs_data(variables, year, api_key, zip_mode=zip_code)
     except (InvalidAPIKeyError, CensusAPIError) as e:
         _handle_api_error(e)
+    except httpx.HTTPError as e:
+        _handle_request_error(e)
 
     if output:
-        with open(output, "w", newline="") as f:
+        with open(output, "w", newline="", buffering=CSV_BUFFER_SIZE) as f:
             writer = csv.writer(f)
-            count = write_csv(rows, variables, writer, show_year=show_year, county_filter=county, sort_col=sort, zip_mode=zip_code)
+            count = write_csv(table, variables, writer, show_year=show_year, county_filter=county, sort_col=sort, zip_mode=zip_code)
         if count:
             typer.echo(f"Wrote CSV to {output}", err=True)
         else:
             typer.echo("No matching rows found.", err=True)
     else:
         writer = csv.writer(sys.stdout)
-        count = write_csv(rows, variables, writer, show_year=show_year, county_filter=county, sort_col=sort, zip_mode=zip_code)
+        count = write_csv(table, variables, writer, show_year=show_year, county_filter=county, sort_col=sort, zip_mode=zip_code)
         if not count:
             typer.echo("No matching rows found.", err=True)
 
@@ -164,117 +203,63 @@ def info(
     api_key = _get_key()
     try:
         all_vars = resolve_variables(["all"], None)
-        rows = fetch_acs_data(all_vars, year, api_key)
+        table = fetch_acs_data(all_vars, year, api_key)
     except (InvalidAPIKeyError, CensusAPIError) as e:
         _handle_api_error(e)
+    except httpx.HTTPError as e:
+        _handle_request_error(e)
 
     filt = county_name.lower()
-    matches = [r for r in rows if filt in r.get("NAME", "").lower()]
+    names = table.get("NAME", [])
+    names_lc = table.get(NAME_LC) or [name.lower() for name in names]
+    matches = [i for i, name in enumerate(names_lc) if filt in name]
 
     if not matches:
         typer.echo(f"No county matching '{county_name}' found.", err=True)
         raise typer.Exit(1)
 
+    match_names = [clean_county_name(names[i]) for i in matches]
+    match_keys = [(name, _county_key(name)) for name in match_names]
+
     writer = csv.writer(sys.stdout)
     writer.writerow(["County", "Field", "Value"])
-    from acs_cli import clean_county_name
-    for row in matches:
-        name = clean_county_name(row.get("NAME", ""))
-        for v in all_vars:
-            writer.writerow([name, v.label, format_value(row.get(v.code), v.format)])
-
-    # Append PLACES data (best-effort — CDC failure should not break Census output)
-    try:
-        places_measures = resolve_measures(["all"])
-        places_rows = fetch_places_data(places_measures)
-        for row in matches:
-            census_name = clean_county_name(row.get("NAME", ""))
-            # Match by county name substring against PLACES locationname
-            for pr in places_rows:
-                loc = pr.get("locationname", "")
-                if filt in loc.lower():
-                    for m in places_measures:
-                        val = pr.get(m.measureid, "")
-                        writer.writerow([census_name, f"PLACES: {m.label}", val])
-                    break
-    except Exception:
-        pass
-
-    # Append CMS access data (best-effort)
-    try:
-        access_measures = resolve_access_measures(["all"])
-        access_rows = fetch_access_data(access_measures)
-        for row in matches:
-            census_name = clean_county_name(row.get("NAME", ""))
-            for ar in access_rows:
-                if filt in ar.get("county", "").lower():
-                    for m in access_measures:
-                        val = ar.get(m.measure_id, "")
-                        writer.writerow([census_name, f"Access: {m.label}", val])
-                    break
-    except Exception:
-        pass
-
-    # Append HRSA shortage data (best-effort)
-    try:
-        hpsa_measures = resolve_hpsa_measures(["all"])
-        hpsa_rows = fetch_shortage_data(hpsa_measures)
-        for row in matches:
-            census_name = clean_county_name(row.get("NAME", ""))
-            for hr in hpsa_rows:
-                if filt in hr.get("county", "").lower():
-                    for m in hpsa_measures:
-                        val = hr.get(m.measure_id, "")
-                        writer.writerow([census_name, f"Shortage: {m.label}", val])
-                    break
-    except Exception:
-        pass
-
-    # Append BLS economy data (best-effort)
-    try:
-        bls_key = get_bls_api_key()
-        econ_measures = resolve_economy_measures(["all"])
-        econ_rows = fetch_economy_data(econ_measures, year=year, api_key=bls_key)
-        for row in matches:
-            census_name = clean_county_name(row.get("NAME", ""))
-            for er in econ_rows:
-                if filt in er.get("county", "").lower():
-                    for m in econ_measures:
-                        val = er.get(m.measure_id, "")
-                        writer.writerow([census_name, f"Economy: {m.label}", val])
-                    break
-    except Exception:
-        pass
-
-    # Append BLS QCEW data (best-effort, no API key needed)
-    try:
-        qcew_measures = resolve_qcew_measures(["all"])
-        qcew_rows = fetch_qcew_data(qcew_measures)
-        for row in matches:
-            census_name = clean_county_name(row.get("NAME", ""))
-            for qr in qcew_rows:
-                if filt in qr.get("county", "").lower():
-                    for m in qcew_measures:
-                        val = qr.get(m.measure_id, "")
-                        writer.writerow([census_name, f"QCEW: {m.label}", val])
-                    break
-    except Exception:
-        pass
-
-    # Append AHRF provider data (best-effort, no API key needed)
-    try:
-        ahrf_measures = resolve_ahrf_measures(["all"])
-        ahrf_rows = fetch_ahrf_data(ahrf_measures)
-        for row in matches:
-            census_name = clean_county_name(row.get("NAME", ""))
-            for ar in ahrf_rows:
-                if filt in ar.get("county", "").lower():
-                    for m in ahrf_measures:
-                        val = ar.get(m.measure_id, "")
-                        writer.writerow([census_name, f"Provider: {m.label}", val])
-                    break
-    except Exception:
-        pass
+    # Resolve each variable's column once, not once per matched county
+    columns = [(v, table.get(v.code) or [None] * len(names)) for v in all_vars]
+    for name, i in zip(match_names, matches):
+        writer.writerows([[name, v.label, format_value(col[i], v.format)] for v, col in columns])
+
+    # Supplementary sources are independent and I/O-bound, so fetch them
+    # concurrently. Each is best-effort: a failure in one source must not
+    # break the Census output or the other sources.
+    places_measures = resolve_measures(["all"])
+    access_measures = resolve_access_measures(["all"])
+    hpsa_measures = resolve_hpsa_measures(["all"])
+    econ_measures = resolve_economy_measures(["all"])
+    qcew_measures = resolve_qcew_measures(["all"])
+    ahrf_measures = resolve_ahrf_measures(["all"])
+
+    def _fetch_economy() -> list[dict]:
+        return fetch_economy_data(econ_measures, year=year, api_key=get_bls_api_key())
+
+    with ThreadPoolExecutor(max_workers=6) as pool:
+        sections = [
+            ("PLACES", "locationname", places_measures, "measureid", pool.submit(fetch_places_data, places_measures)),
+            ("Access", "county", access_measures, "measure_id", pool.submit(fetch_access_data, access_measures)),
+            ("Shortage", "county", hpsa_measures, "measure_id", pool.submit(fetch_shortage_data, hpsa_measures)),
+            ("Economy", "county", econ_measures, "measure_id", pool.submit(_fetch_economy)),
+            ("QCEW", "county", qcew_measures, "measure_id", pool.submit(fetch_qcew_data, qcew_measures)),
+            ("Provider", "county", ahrf_measures, "measure_id", pool.submit(fetch_ahrf_data, ahrf_measures)),
+        ]
+        for prefix, county_field, measures, id_attr, future in sections:
+            try:
+                by_county = _index_by_county(future.result(), county_field)
+            except Exception:
+                continue
+            for census_name, key in match_keys:
+                src = by_county.get(key)
+                if src is not None:
+                    for m in measures:
+                        writer.writerow([census_name, f"{prefix}: {m.label}", src.get(getattr(m, id_attr), "")])
 
 
 @app.command("places-topics")
@@ -314,7 +299,7 @@ def places_cmd(
         raise typer.Exit(1)
 
     if output:
-        with open(output, "w", newline="") as f:
+        with open(output, "w", newline="", buffering=CSV_BUFFER_SIZE) as f:
             writer = csv.writer(f)
             count = write_places_csv(rows, measures, writer, county_filter=county, sort_col=sort)
         if count:
@@ -391,44 +376,17 @@ def access_cmd(
         by_county.setdefault(c, {"county": c}).update(row)
 
     merged = sorted(by_county.values(), key=lambda r: r.get("county", ""))
-    all_measure_cols = (
-        [(m.measure_id, m.label) for m in cms_measures]
-        + [(m.measure_id, m.label) for m in hrsa_measures]
-    )
-
-    # Filter / sort / write
-    if county:
-        filt = county.lower()
-        merged = [r for r in merged if filt in r.get("county", "").lower()]
-
-    if sort:
-        target_id = sort
-        for mid, label in all_measure_cols:
-            if label.lower() == sort.lower():
-                target_id = mid
-                break
-        merged.sort(key=lambda r: float(r.get(target_id, 0) or 0), reverse=True)
-
-    def _write_rows(writer: csv.writer) -> int:
-        if not merged:
-            return 0
-        writer.writerow(["County"] + [label for _, label in all_measure_cols])
-        for row in merged:
-            csv_row = [row.get("county", "")]
-            for mid, _ in all_measure_cols:
-                csv_row.append(row.get(mid, ""))
-            writer.writerow(csv_row)
-        return len(merged)
+    measures = cms_measures + hrsa_measures
 
     if output:
-        with open(output, "w", newline="") as f:
-            count = _write_rows(csv.writer(f))
+        with open(output, "w", newline="", buffering=CSV_BUFFER_SIZE) as f:
+            count = write_measure_csv(merged, measures, csv.writer(f), county_filter=county, sort_col=sort)
         if count:
             typer.echo(f"Wrote CSV to {output}", err=True)
         else:
             typer.echo("No matching rows found.", err=True)
     else:
-        count = _write_rows(csv.writer(sys.stdout))
+        count = write_measure_csv(merged, measures, csv.writer(sys.stdout), county_filter=county, sort_col=sort)
         if not count:
             typer.echo("No matching rows found.", err=True)
 
@@ -484,7 +442,7 @@ def economy_cmd(
         raise typer.Exit(1)
 
     if output:
-        with open(output, "w", newline="") as f:
+        with open(output, "w", newline="", buffering=CSV_BUFFER_SIZE) as f:
             w = csv.writer(f)
             count = write_economy_csv(rows, measures, w, county_filter=county, sort_col=sort)
         if count:
@@ -537,7 +495,7 @@ def qcew_cmd(
         raise typer.Exit(1)
 
     if output:
-        with open(output, "w", newline="") as f:
+        with open(output, "w", newline="", buffering=CSV_BUFFER_SIZE) as f:
             w = csv.writer(f)
             count = write_qcew_csv(rows, measures, w, county_filter=county, sort_col=sort)
         if count:
@@ -589,7 +547,7 @@ def providers_cmd(
         raise typer.Exit(1)
 
     if output:
-        with open(output, "w", newline="") as f:
+        with open(output, "w", newline="", buffering=CSV_BUFFER_SIZE) as f:
             w = csv.writer(f)
             count = write_ahrf_csv(rows, measures, w, county_filter=county, sort_col=sort)
         if count:
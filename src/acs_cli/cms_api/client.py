@@ -1,13 +1,21 @@
 from __future__ import annotations
 
+import asyncio
 import csv
 from dataclasses import dataclass
 
 import httpx
 
+from acs_cli import NUMERIC_RE, load_json
+from acs_cli.cache import read_cached, write_cached
+from acs_cli.tabular import write_measure_csv
+
 # ── Constants ────────────────────────────────────────────────────────────────
 
 HOSPITAL_BASE_URL = "https://data.cms.gov/provider-data/api/1/datastore/query/xubh-q36u/0"
+HOSPITAL_PAGE_SIZE = 500
+MAX_CONCURRENT_REQUESTS = 8
+_YES_VALUES = frozenset({"yes", "y", "true"})
 
 
 # ── Data model ───────────────────────────────────────────────────────────────
@@ -31,6 +39,8 @@ ACCESS_MEASURES: dict[str, list[AccessMeasure]] = {
     ],
 }
 
+_ALL_ACCESS_MEASURES: tuple[AccessMeasure, ...] = tuple(m for ms in ACCESS_MEASURES.values() for m in ms)
+
 
 # ── Errors ───────────────────────────────────────────────────────────────────
 
@@ -46,7 +56,7 @@ class CMSAPIError(Exception):
 
 def resolve_access_measures(groups: list[str]) -> list[AccessMeasure]:
     if "all" in groups:
-        groups = list(ACCESS_MEASURES.keys())
+        return list(_ALL_ACCESS_MEASURES)
     measures: list[AccessMeasure] = []
     for g in groups:
         if g not in ACCESS_MEASURES:
@@ -61,86 +71,145 @@ def resolve_access_measures(groups: list[str]) -> list[AccessMeasure]:
 # ── Fetch hospital data ─────────────────────────────────────────────────────
 
 
-def fetch_hospital_data() -> list[dict]:
-    """Fetch Michigan hospital records from CMS Provider Data."""
-    all_records: list[dict] = []
-    limit = 500
-    offset = 0
-
-    while True:
-        params: dict[str, str | int] = {
-            "offset": offset,
-            "limit": limit,
-            "conditions[0][property]": "state",
-            "conditions[0][value]": "MI",
-            "conditions[0][operator]": "=",
-        }
-        resp = httpx.get(HOSPITAL_BASE_URL, params=params, timeout=30)
-        if resp.status_code != 200:
-            raise CMSAPIError(resp.status_code, resp.text[:200])
-
-        data = resp.json()
-        results = data.get("results", []) if isinstance(data, dict) else data
-        if not results:
-            break
-        all_records.extend(results)
-        if len(results) < limit:
-            break
-        offset += limit
+def _page_results(data: dict | list) -> list[dict]:
+    return data.get("results", []) if isinstance(data, dict) else data
+
+
+async def _fetch_hospital_page(client: httpx.AsyncClient, offset: int) -> dict | list:
+    params: dict[str, str | int] = {
+        "offset": offset,
+        "limit": HOSPITAL_PAGE_SIZE,
+        "conditions[0][property]": "state",
+        "conditions[0][value]": "MI",
+        "conditions[0][operator]": "=",
+    }
+    content = read_cached(HOSPITAL_BASE_URL, params)
+    if content is not None:
+        return load_json(content)
+    resp = await client.get(HOSPITAL_BASE_URL, params=params)
+    if resp.status_code != 200:
+        raise CMSAPIError(resp.status_code, resp.text[:200])
+    data = load_json(resp.content)
+    # Only cache bodies that decoded to a real result, not an error payload
+    if not (isinstance(data, dict) and "error" in data):
+        write_cached(HOSPITAL_BASE_URL, params, resp.content)
+    return data
+
+
+async def _fetch_hospital_pages() -> list[dict]:
+    limits = httpx.Limits(max_connections=MAX_CONCURRENT_REQUESTS, max_keepalive_connections=MAX_CONCURRENT_REQUESTS)
+    async with httpx.AsyncClient(timeout=30, limits=limits) as client:
+        first = await _fetch_hospital_page(client, 0)
+        all_records = _page_results(first)
+        if len(all_records) < HOSPITAL_PAGE_SIZE:
+            return all_records
+
+        # The datastore reports the total row count, so the remaining
+        # pages can be requested together.
+        total = first.get("count") if isinstance(first, dict) else None
+        if isinstance(total, int):
+            # Bound in-flight requests, not just connections: a large server-
+            # reported count would otherwise queue every page on the pool
+            sem = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+
+            async def _bounded(offset: int) -> dict | list:
+                async with sem:
+                    return await _fetch_hospital_page(client, offset)
+
+            # A TaskGroup cancels the outstanding pages as soon as one fails
+            offsets = range(HOSPITAL_PAGE_SIZE, total, HOSPITAL_PAGE_SIZE)
+            try:
+                async with asyncio.TaskGroup() as tg:
+                    tasks = [tg.create_task(_bounded(o)) for o in offsets]
+            except ExceptionGroup as eg:
+                raise eg.exceptions[0] from None
+            for task in tasks:
+                all_records.extend(_page_results(task.result()))
+            return all_records
+
+        # No count — walk pages until one comes back short
+        offset = HOSPITAL_PAGE_SIZE
+        while True:
+            results = _page_results(await _fetch_hospital_page(client, offset))
+            if not results:
+                break
+            all_records.extend(results)
+            if len(results) < HOSPITAL_PAGE_SIZE:
+                break
+            offset += HOSPITAL_PAGE_SIZE
 
     return all_records
 
 
+def fetch_hospital_data() -> list[dict]:
+    """Fetch Michigan hospital records from CMS Provider Data."""
+    return asyncio.run(_fetch_hospital_pages())
+
+
 # ── Aggregate hospitals ─────────────────────────────────────────────────────
 
 
+@dataclass(slots=True)
+class _CountyTally:
+    """Running hospital counts for one county while aggregating."""
+
+    county: str
+    hospital_count: int = 0
+    acute_care_hospitals: int = 0
+    critical_access_hospitals: int = 0
+    emergency_services: int = 0
+    birthing_friendly: int = 0
+    rating_sum: float = 0.0
+    rating_count: int = 0
+
+    def to_row(self) -> dict:
+        avg = str(round(self.rating_sum / self.rating_count, 1)) if self.rating_count else ""
+        return {
+            "county": self.county,
+            "hospital_count": self.hospital_count,
+            "acute_care_hospitals": self.acute_care_hospitals,
+            "critical_access_hospitals": self.critical_access_hospitals,
+            "emergency_services": self.emergency_services,
+            "birthing_friendly": self.birthing_friendly,
+            "avg_hospital_rating": avg,
+        }
+
+
 def _aggregate_hospitals_by_county(records: list[dict]) -> list[dict]:
     """Group hospital records by county and compute access metrics."""
-    by_county: dict[str, dict] = {}
+    by_county: dict[str, _CountyTally] = {}
 
     for rec in records:
-        county = rec.get("countyparish", "").strip()
+        rec_get = rec.get
+        county = rec_get("countyparish", "").strip()
         if not county:
             continue
         county = county.title()
 
-        if county not in by_county:
-            by_county[county] = {
-                "county": county,
-                "hospital_count": 0,
-                "acute_care_hospitals": 0,
-                "critical_access_hospitals": 0,
-                "emergency_services": 0,
-                "birthing_friendly": 0,
-                "_ratings": [],
-            }
-
-        data = by_county[county]
-        data["hospital_count"] += 1
+        tally = by_county.get(county)
+        if tally is None:
+            tally = by_county[county] = _CountyTally(county)
+        tally.hospital_count += 1
 
-        h_type = rec.get("hospital_type", "")
-        if "Acute Care" in h_type:
-            data["acute_care_hospitals"] += 1
-        elif "Critical Access" in h_type:
-            data["critical_access_hospitals"] += 1
+        h_type = rec_get("hospital_type", "")
+        if h_type.startswith("Acute Care"):
+            tally.acute_care_hospitals += 1
+        elif h_type.startswith("Critical Access"):
+            tally.critical_access_hospitals += 1
 
-        if rec.get("emergency_services", "").lower() in ("yes", "y", "true"):
-            data["emergency_services"] += 1
+        if rec_get("emergency_services", "").lower() in _YES_VALUES:
+            tally.emergency_services += 1
 
-        if rec.get("meets_criteria_for_birthing_friendly_designation", "").upper() == "Y":
-            data["birthing_friendly"] += 1
+        if rec_get("meets_criteria_for_birthing_friendly_designation", "").upper() == "Y":
+            tally.birthing_friendly += 1
 
-        rating = rec.get("hospital_overall_rating", "")
-        try:
-            data["_ratings"].append(float(rating))
-        except (ValueError, TypeError):
-            pass
+        # Ratings are "1"-"5" or "Not Available"; screen before converting
+        rating = rec_get("hospital_overall_rating")
+        if isinstance(rating, (int, float)) or (isinstance(rating, str) and NUMERIC_RE.fullmatch(rating)):
+            tally.rating_sum += float(rating)
+            tally.rating_count += 1
 
-    for data in by_county.values():
-        ratings = data.pop("_ratings")
-        data["avg_hospital_rating"] = str(round(sum(ratings) / len(ratings), 1)) if ratings else ""
-
-    return sorted(by_county.values(), key=lambda r: r.get("county", ""))
+    return [by_county[c].to_row() for c in sorted(by_county)]
 
 
 # ── Top-level orchestrator ──────────────────────────────────────────────────
@@ -163,31 +232,11 @@ def write_access_csv(
     sort_col: str | None = None,
     header: bool = True,
 ) -> int:
-    if county_filter:
-        filt = county_filter.lower()
-        rows = [r for r in rows if filt in r.get("county", "").lower()]
-
-    if not rows:
-        return 0
-
-    if sort_col:
-        target_id = None
-        for m in measures:
-            if m.label.lower() == sort_col.lower():
-                target_id = m.measure_id
-                break
-        if target_id is None:
-            target_id = sort_col
-        rows.sort(key=lambda r: float(r.get(target_id, 0) or 0), reverse=True)
-
-    if header:
-        columns = ["County"] + [m.label for m in measures]
-        writer.writerow(columns)
-
-    for row in rows:
-        csv_row = [row.get("county", "")]
-        for m in measures:
-            csv_row.append(row.get(m.measure_id, ""))
-        writer.writerow(csv_row)
-
-    return len(rows)
+    return write_measure_csv(
+        rows,
+        measures,
+        writer,
+        county_filter=county_filter,
+        sort_col=sort_col,
+        header=header,
+    )
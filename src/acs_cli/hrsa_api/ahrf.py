@@ -9,6 +9,7 @@ from pathlib import Path
 import pandas as pd
 
 from acs_cli.hrsa_api.client import MI_FIPS_TO_COUNTY
+from acs_cli.tabular import write_measure_csv
 
 # ── Constants ────────────────────────────────────────────────────────────────
 
@@ -173,31 +174,11 @@ def write_ahrf_csv(
     sort_col: str | None = None,
     header: bool = True,
 ) -> int:
-    if county_filter:
-        filt = county_filter.lower()
-        rows = [r for r in rows if filt in r.get("county", "").lower()]
-
-    if not rows:
-        return 0
-
-    if sort_col:
-        target_id = None
-        for m in measures:
-            if m.label.lower() == sort_col.lower():
-                target_id = m.measure_id
-                break
-        if target_id is None:
-            target_id = sort_col
-        rows.sort(key=lambda r: float(r.get(target_id, 0) or 0), reverse=True)
-
-    if header:
-        columns = ["County"] + [m.label for m in measures]
-        writer.writerow(columns)
-
-    for row in rows:
-        csv_row = [row.get("county", "")]
-        for m in measures:
-            csv_row.append(row.get(m.measure_id, ""))
-        writer.writerow(csv_row)
-
-    return len(rows)
+    return write_measure_csv(
+        rows,
+        measures,
+        writer,
+        county_filter=county_filter,
+        sort_col=sort_col,
+        header=header,
+    )
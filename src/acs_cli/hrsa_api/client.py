@@ -1,9 +1,20 @@
 from __future__ import annotations
 
+import asyncio
 import csv
+from collections.abc import Callable, Mapping
 from dataclasses import dataclass
+from functools import lru_cache
+from itertools import chain
+from types import MappingProxyType
 
 import httpx
+import numpy as np
+import pandas as pd
+
+from acs_cli import load_json
+from acs_cli.cache import read_cached, write_cached
+from acs_cli.tabular import write_measure_csv
 
 # ── Constants ────────────────────────────────────────────────────────────────
 
@@ -18,13 +29,16 @@ HPSA_LAYERS: dict[str, tuple[str, str]] = {
     "mental_health_shortage": ("/5/query", "mh"),
 }
 
-HPSA_OUT_FIELDS = (
-    "CMN_STATE_COUNTY_FIPS_CD,HPSA_SCORE,HPSA_STATUS_DESC,"
-    "HPSA_DEGREE_OF_SHORTAGE,HPSA_FORMAL_RATIO,HPSA_ESTIMATED_UNDERSERVED_POP"
-)
+HPSA_PAGE_SIZE = 1000
+HPSA_SPECULATIVE_PAGES = 4  # pages requested together once a layer overflows
+MAX_CONCURRENT_REQUESTS = 8
 
-# Michigan FIPS → county name
-MI_FIPS_TO_COUNTY: dict[str, str] = {
+# Only the attributes the county aggregation reads, so each decoded feature
+# carries three fields instead of six
+HPSA_OUT_FIELDS = "CMN_STATE_COUNTY_FIPS_CD,HPSA_SCORE,HPSA_ESTIMATED_UNDERSERVED_POP"
+
+# Michigan FIPS → county name (read-only)
+MI_FIPS_TO_COUNTY: Mapping[str, str] = MappingProxyType({
     "26001": "Alcona", "26003": "Alger", "26005": "Allegan",
     "26007": "Alpena", "26009": "Antrim", "26011": "Arenac",
     "26013": "Baraga", "26015": "Barry", "26017": "Bay",
@@ -53,7 +67,18 @@ MI_FIPS_TO_COUNTY: dict[str, str] = {
     "26151": "Sanilac", "26153": "Schoolcraft", "26155": "Shiawassee",
     "26157": "Tuscola", "26159": "Van Buren", "26161": "Washtenaw",
     "26163": "Wayne", "26165": "Wexford",
-}
+})
+
+# (FIPS, county name) pairs in FIPS order, for code that walks every county
+MI_COUNTY_FIPS: tuple[tuple[str, str], ...] = tuple(sorted(MI_FIPS_TO_COUNTY.items()))
+
+
+# Sorted numeric FIPS keys with parallel names: the dense county index used
+# for grouped reductions over HPSA features
+_FIPS_KEYS = np.array(sorted(int(k) for k in MI_FIPS_TO_COUNTY), dtype=np.int64)
+_FIPS_DIGIT_WEIGHTS = np.array([10_000, 1_000, 100, 10, 1], dtype=np.int64)
+_FIPS_COUNTIES: tuple[str, ...] = tuple(MI_FIPS_TO_COUNTY[str(k)] for k in _FIPS_KEYS)
+_COUNTY_ORDER: tuple[int, ...] = tuple(sorted(range(len(_FIPS_COUNTIES)), key=_FIPS_COUNTIES.__getitem__))
 
 
 # ── Data model ───────────────────────────────────────────────────────────────
@@ -81,6 +106,8 @@ HPSA_MEASURES: dict[str, list[HPSAMeasure]] = {
     ],
 }
 
+_ALL_HPSA_MEASURES: tuple[HPSAMeasure, ...] = tuple(m for ms in HPSA_MEASURES.values() for m in ms)
+
 
 # ── Errors ───────────────────────────────────────────────────────────────────
 
@@ -96,100 +123,215 @@ class HRSAAPIError(Exception):
 
 def resolve_hpsa_measures(groups: list[str]) -> list[HPSAMeasure]:
     if "all" in groups:
-        groups = list(HPSA_MEASURES.keys())
-    measures: list[HPSAMeasure] = []
-    for g in groups:
-        if g not in HPSA_MEASURES:
-            raise ValueError(
-                f"Unknown shortage group '{g}'. "
-                f"Available: {', '.join(HPSA_MEASURES.keys())}"
-            )
-        measures.extend(HPSA_MEASURES[g])
-    return measures
+        return list(_ALL_HPSA_MEASURES)
+    unknown = [g for g in groups if g not in HPSA_MEASURES]
+    if unknown:
+        raise ValueError(
+            f"Unknown shortage group '{unknown[0]}'. "
+            f"Available: {', '.join(HPSA_MEASURES.keys())}"
+        )
+    return list(chain.from_iterable(HPSA_MEASURES[g] for g in groups))
 
 
 # ── Fetch HPSA data ─────────────────────────────────────────────────────────
 
 
-def fetch_hpsa_data(layer_path: str) -> list[dict]:
-    """Fetch Michigan HPSA data from HRSA ArcGIS service for a given layer."""
+async def _fetch_hpsa_page(client: httpx.AsyncClient, url: str, offset: int) -> dict:
+    params: dict[str, str | int] = {
+        "where": "PRIMARY_STATE_NM='Michigan'",
+        "outFields": HPSA_OUT_FIELDS,
+        "returnGeometry": "false",
+        "f": "json",
+        "resultOffset": offset,
+        "resultRecordCount": HPSA_PAGE_SIZE,
+    }
+    content = read_cached(url, params)
+    if content is not None:
+        return load_json(content)
+    resp = await client.get(url, params=params)
+    if resp.status_code != 200:
+        raise HRSAAPIError(resp.status_code, resp.text[:200])
+    data = load_json(resp.content)
+    # ArcGIS reports query failures as 200 with an "error" body; never pin one
+    if "error" not in data:
+        write_cached(url, params, resp.content)
+    return data
+
+
+async def _fetch_hpsa_layer(
+    client: httpx.AsyncClient,
+    layer_path: str,
+    on_page: Callable[[list[dict]], None],
+) -> None:
+    """Page through one HPSA layer, handing each page's features to ``on_page``.
+
+    Pages are passed on in offset order and not retained, so callers that
+    reduce as they go never hold the whole layer in memory.
+    """
     url = HRSA_BASE_URL + layer_path
-    all_features: list[dict] = []
     offset = 0
-    limit = 1000
+    pages = [await _fetch_hpsa_page(client, url, offset)]
 
     while True:
-        params: dict[str, str | int] = {
-            "where": "PRIMARY_STATE_NM='Michigan'",
-            "outFields": HPSA_OUT_FIELDS,
-            "returnGeometry": "false",
-            "f": "json",
-            "resultOffset": offset,
-            "resultRecordCount": limit,
-        }
-        resp = httpx.get(url, params=params, timeout=30)
-        if resp.status_code != 200:
-            raise HRSAAPIError(resp.status_code, resp.text[:200])
-
-        data = resp.json()
-        features = data.get("features", [])
-        if not features:
-            break
-        all_features.extend(features)
-        if not data.get("exceededTransferLimit", False):
-            break
-        offset += limit
+        for data in pages:
+            features = data.get("features", [])
+            if not features:
+                return
+            on_page(features)
+            if not data.get("exceededTransferLimit", False):
+                return
+            offset += HPSA_PAGE_SIZE
+        # ArcGIS doesn't report a total, so request the next few pages
+        # together; pages past the end come back empty and are ignored.
+        offsets = [offset + i * HPSA_PAGE_SIZE for i in range(HPSA_SPECULATIVE_PAGES)]
+        pages = await asyncio.gather(*(_fetch_hpsa_page(client, url, o) for o in offsets))
+
+
+async def _fetch_hpsa_layers(layers: list[tuple[str, Callable[[list[dict]], None]]]) -> None:
+    limits = httpx.Limits(max_connections=MAX_CONCURRENT_REQUESTS)
+    async with httpx.AsyncClient(timeout=30, limits=limits) as client:
+        await asyncio.gather(*(_fetch_hpsa_layer(client, path, on_page) for path, on_page in layers))
 
+
+def fetch_hpsa_data(layer_path: str) -> list[dict]:
+    """Fetch Michigan HPSA data from HRSA ArcGIS service for a given layer."""
+    all_features: list[dict] = []
+    asyncio.run(_fetch_hpsa_layers([(layer_path, all_features.extend)]))
     return all_features
 
 
 # ── Aggregate HPSA by county ────────────────────────────────────────────────
 
 
-def _aggregate_hpsa_by_county(features: list[dict], prefix: str) -> list[dict]:
-    """Group HPSA features by county FIPS and compute scores."""
-    by_county: dict[str, dict] = {}
+def _to_numeric(values: list) -> np.ndarray:
+    """Convert raw attribute values to float64, with NaN for missing or non-numeric."""
+    return pd.to_numeric(pd.Series(values, dtype=object), errors="coerce").to_numpy(dtype=np.float64)
+
+
+def _fips_positions(fips: list) -> tuple[np.ndarray, np.ndarray]:
+    """Return (county position, is-Michigan mask) for each raw FIPS code."""
+    # Decode 5-digit codes arithmetically from their UCS-4 code points; the
+    # sixth slot catches longer strings (it must be empty).
+    chars = np.array(fips, dtype="U6").view(np.uint32).reshape(-1, 6).astype(np.int64)
+    digits = chars[:, :5] - ord("0")
+    numeric = ((digits >= 0) & (digits <= 9)).all(axis=1) & (chars[:, 5] == 0)
+    values = np.where(numeric, digits @ _FIPS_DIGIT_WEIGHTS, 0)
+    pos = np.minimum(np.searchsorted(_FIPS_KEYS, values), len(_FIPS_KEYS) - 1)
+    return pos, numeric & (_FIPS_KEYS[pos] == values)
+
+
+@dataclass(slots=True)
+class _HPSAColumns:
+    """Per-county aggregates for one HPSA layer, one array slot per county in
+    ``_FIPS_COUNTIES`` order."""
+
+    counts: np.ndarray
+    score_counts: np.ndarray
+    score_sums: np.ndarray
+    score_max: np.ndarray
+    pop_sums: np.ndarray
+
+    @classmethod
+    def empty(cls) -> _HPSAColumns:
+        n = len(_FIPS_COUNTIES)
+        return cls(
+            counts=np.zeros(n, dtype=np.int64),
+            score_counts=np.zeros(n, dtype=np.int64),
+            score_sums=np.zeros(n),
+            score_max=np.full(n, -np.inf),
+            pop_sums=np.zeros(n),
+        )
+
+    def add(self, other: _HPSAColumns) -> None:
+        """Fold another batch of features' aggregates into this one."""
+        self.counts += other.counts
+        self.score_counts += other.score_counts
+        self.score_sums += other.score_sums
+        np.maximum(self.score_max, other.score_max, out=self.score_max)
+        self.pop_sums += other.pop_sums
+
+    def fields(self, i: int, keys: tuple[str, str, str, str]) -> dict:
+        """Output measures for county position ``i``, named by ``_measure_keys``."""
+        count_key, max_key, avg_key, pop_key = keys
+        scored = self.score_counts[i] > 0
+        pop = int(self.pop_sums[i])
+        return {
+            count_key: int(self.counts[i]),
+            max_key: str(float(self.score_max[i])) if scored else "",
+            avg_key: f"{self.score_sums[i] / self.score_counts[i]:.1f}" if scored else "",
+            pop_key: str(pop) if pop else "",
+        }
+
+
+@lru_cache(maxsize=None)
+def _measure_keys(prefix: str) -> tuple[str, str, str, str]:
+    """Output keys for a layer prefix, built once rather than per county."""
+    return (
+        f"{prefix}_hpsa_count",
+        f"{prefix}_hpsa_max_score",
+        f"{prefix}_hpsa_avg_score",
+        f"{prefix}_underserved_pop",
+    )
+
 
+def _hpsa_columns(features: list[dict]) -> _HPSAColumns:
+    """Reduce HPSA features to per-county count, score and population columns."""
+    # One pass to pull out raw columns; typed conversion happens in bulk below
+    fips_raw: list = []
+    scores_raw: list = []
+    pops_raw: list = []
     for feat in features:
         attrs = feat.get("attributes", {})
-        fips = str(attrs.get("CMN_STATE_COUNTY_FIPS_CD", ""))
-        county = MI_FIPS_TO_COUNTY.get(fips)
-        if not county:
-            continue
-
-        if county not in by_county:
-            by_county[county] = {
-                "county": county,
-                f"{prefix}_hpsa_count": 0,
-                f"_{prefix}_scores": [],
-                f"_{prefix}_pop": 0,
-            }
-
-        data = by_county[county]
-        data[f"{prefix}_hpsa_count"] += 1
-
-        score = attrs.get("HPSA_SCORE")
-        if score is not None:
-            try:
-                data[f"_{prefix}_scores"].append(float(score))
-            except (ValueError, TypeError):
-                pass
-
-        pop = attrs.get("HPSA_ESTIMATED_UNDERSERVED_POP")
-        if pop is not None:
-            try:
-                data[f"_{prefix}_pop"] += int(pop)
-            except (ValueError, TypeError):
-                pass
-
-    for data in by_county.values():
-        scores = data.pop(f"_{prefix}_scores")
-        data[f"{prefix}_hpsa_max_score"] = str(max(scores)) if scores else ""
-        data[f"{prefix}_hpsa_avg_score"] = str(round(sum(scores) / len(scores), 1)) if scores else ""
-        pop = data.pop(f"_{prefix}_pop")
-        data[f"{prefix}_underserved_pop"] = str(pop) if pop else ""
-
-    return sorted(by_county.values(), key=lambda r: r.get("county", ""))
+        fips_raw.append(attrs.get("CMN_STATE_COUNTY_FIPS_CD", ""))  # numpy stringifies in bulk
+        scores_raw.append(attrs.get("HPSA_SCORE"))
+        pops_raw.append(attrs.get("HPSA_ESTIMATED_UNDERSERVED_POP"))
+
+    # Map FIPS codes to dense county positions; anything not in Michigan drops out
+    county_idx, in_state = _fips_positions(fips_raw)
+    county_idx = county_idx[in_state]
+    score_arr = _to_numeric(scores_raw)[in_state]
+    # Populations are whole people: truncate, and count missing values as zero
+    pop_arr = np.nan_to_num(np.trunc(_to_numeric(pops_raw)[in_state]))
+
+    # Grouped reductions over the 83 counties
+    n = len(_FIPS_COUNTIES)
+    has_score = ~np.isnan(score_arr)
+    scored_idx = county_idx[has_score]
+    score_arr = score_arr[has_score]
+
+    score_max = np.full(n, -np.inf)
+    np.maximum.at(score_max, scored_idx, score_arr)
+    return _HPSAColumns(
+        counts=np.bincount(county_idx, minlength=n),
+        score_counts=np.bincount(scored_idx, minlength=n),
+        score_sums=np.bincount(scored_idx, weights=score_arr, minlength=n),
+        score_max=score_max,
+        pop_sums=np.bincount(county_idx, weights=pop_arr, minlength=n),
+    )
+
+
+def _hpsa_rows(layers: list[tuple[str, _HPSAColumns]]) -> list[dict]:
+    """Build one row per county with HPSA designations in any layer, sorted by name.
+
+    Each row carries only the measures of layers that cover that county.
+    """
+    keyed = [(_measure_keys(prefix), cols) for prefix, cols in layers]
+    rows: list[dict] = []
+    for i in _COUNTY_ORDER:
+        row: dict | None = None
+        for keys, cols in keyed:
+            if cols.counts[i]:
+                if row is None:
+                    row = {"county": _FIPS_COUNTIES[i]}
+                row.update(cols.fields(i, keys))
+        if row is not None:
+            rows.append(row)
+    return rows
+
+
+def _aggregate_hpsa_by_county(features: list[dict], prefix: str) -> list[dict]:
+    """Group HPSA features by county FIPS and compute scores."""
+    return _hpsa_rows([(prefix, _hpsa_columns(features))])
 
 
 # ── Top-level orchestrator ──────────────────────────────────────────────────
@@ -198,19 +340,24 @@ def _aggregate_hpsa_by_county(features: list[dict], prefix: str) -> list[dict]:
 def fetch_shortage_data(measures: list[HPSAMeasure]) -> list[dict]:
     """Fetch all requested shortage data and return one row per county."""
     measure_ids = {m.measure_id for m in measures}
-    by_county: dict[str, dict] = {}
-
-    for group_name, (layer_path, prefix) in HPSA_LAYERS.items():
-        group_measures = HPSA_MEASURES.get(group_name, [])
-        if not any(m.measure_id in measure_ids for m in group_measures):
-            continue
-
-        features = fetch_hpsa_data(layer_path)
-        for row in _aggregate_hpsa_by_county(features, prefix):
-            county = row["county"]
-            by_county.setdefault(county, {"county": county}).update(row)
-
-    return sorted(by_county.values(), key=lambda r: r.get("county", ""))
+    layers = [
+        (layer_path, prefix)
+        for group_name, (layer_path, prefix) in HPSA_LAYERS.items()
+        if any(m.measure_id in measure_ids for m in HPSA_MEASURES.get(group_name, []))
+    ]
+    if not layers:
+        return []
+
+    # Layers are independent endpoints, so fetch them together. Each page is
+    # reduced as it arrives, so only per-county totals outlive a page. All
+    # layers share the same county positions, so they merge without keying
+    # on names.
+    totals = [_HPSAColumns.empty() for _ in layers]
+    asyncio.run(_fetch_hpsa_layers([
+        (layer_path, lambda features, acc=acc: acc.add(_hpsa_columns(features)))
+        for (layer_path, _), acc in zip(layers, totals)
+    ]))
+    return _hpsa_rows([(prefix, acc) for (_, prefix), acc in zip(layers, totals)])
 
 
 # ── CSV output ──────────────────────────────────────────────────────────────
@@ -224,31 +371,11 @@ def write_shortage_csv(
     sort_col: str | None = None,
     header: bool = True,
 ) -> int:
-    if county_filter:
-        filt = county_filter.lower()
-        rows = [r for r in rows if filt in r.get("county", "").lower()]
-
-    if not rows:
-        return 0
-
-    if sort_col:
-        target_id = None
-        for m in measures:
-            if m.label.lower() == sort_col.lower():
-                target_id = m.measure_id
-                break
-        if target_id is None:
-            target_id = sort_col
-        rows.sort(key=lambda r: float(r.get(target_id, 0) or 0), reverse=True)
-
-    if header:
-        columns = ["County"] + [m.label for m in measures]
-        writer.writerow(columns)
-
-    for row in rows:
-        csv_row = [row.get("county", "")]
-        for m in measures:
-            csv_row.append(row.get(m.measure_id, ""))
-        writer.writerow(csv_row)
-
-    return len(rows)
+    return write_measure_csv(
+        rows,
+        measures,
+        writer,
+        county_filter=county_filter,
+        sort_col=sort_col,
+        header=header,
+    )
@@ -1,17 +1,25 @@
 from __future__ import annotations
 
+import asyncio
 import csv
+import io
 from dataclasses import dataclass
+from functools import lru_cache
+from itertools import chain
 
 import httpx
 
-from acs_cli import clean_county_name
+from acs_cli import NUMERIC_RE, clean_county_name
+from acs_cli.cache import read_cached, write_cached
+from acs_cli.tabular import write_measure_csv
 
 # ── Constants ────────────────────────────────────────────────────────────────
 
-PLACES_BASE_URL = "https://data.cdc.gov/resource/swc5-untb.json"
+PLACES_BASE_URL = "https://data.cdc.gov/resource/swc5-untb.csv"  # CSV is far smaller than the JSON form
 MICHIGAN_STATE_ABBR = "MI"
 DEFAULT_PLACES_YEAR = 2023
+PLACES_PAGE_SIZE = 10000
+PLACES_SPECULATIVE_PAGES = 4  # pages requested together once a page comes back full
 
 
 # ── Data model ───────────────────────────────────────────────────────────────
@@ -70,6 +78,8 @@ PLACES_MEASURES: dict[str, list[Measure]] = {
     ],
 }
 
+_ALL_PLACES_MEASURES: tuple[Measure, ...] = tuple(chain.from_iterable(PLACES_MEASURES.values()))
+
 
 # ── Errors ───────────────────────────────────────────────────────────────────
 
@@ -83,23 +93,57 @@ class PlacesAPIError(Exception):
 # ── Resolve measures ─────────────────────────────────────────────────────────
 
 
-def resolve_measures(groups: list[str]) -> list[Measure]:
+@lru_cache(maxsize=64)
+def _resolve_groups(groups: tuple[str, ...]) -> tuple[Measure, ...]:
     if "all" in groups:
-        groups = list(PLACES_MEASURES.keys())
-    measures: list[Measure] = []
-    for g in groups:
-        if g not in PLACES_MEASURES:
-            raise ValueError(
-                f"Unknown PLACES group '{g}'. "
-                f"Available: {', '.join(PLACES_MEASURES.keys())}"
-            )
-        measures.extend(PLACES_MEASURES[g])
-    return measures
+        return _ALL_PLACES_MEASURES
+    unknown = [g for g in groups if g not in PLACES_MEASURES]
+    if unknown:
+        raise ValueError(
+            f"Unknown PLACES group '{unknown[0]}'. "
+            f"Available: {', '.join(PLACES_MEASURES.keys())}"
+        )
+    return tuple(chain.from_iterable(PLACES_MEASURES[g] for g in groups))
+
+
+def resolve_measures(groups: list[str]) -> list[Measure]:
+    return list(_resolve_groups(tuple(groups)))
 
 
 # ── Fetch data ───────────────────────────────────────────────────────────────
 
 
+async def _fetch_places_page(client: httpx.AsyncClient, params: dict[str, str | int], offset: int) -> list[dict]:
+    params = {**params, "$offset": offset}
+    content = read_cached(PLACES_BASE_URL, params)
+    if content is None:
+        resp = await client.get(PLACES_BASE_URL, params=params)
+        if resp.status_code != 200:
+            raise PlacesAPIError(resp.status_code, resp.text[:200])
+        content = resp.content
+        write_cached(PLACES_BASE_URL, params, content)
+    return list(csv.DictReader(io.StringIO(content.decode("utf-8"))))
+
+
+async def _fetch_places_pages(params: dict[str, str | int]) -> list[dict]:
+    async with httpx.AsyncClient(timeout=30) as client:
+        all_records: list[dict] = []
+        offset = 0
+        pages = [await _fetch_places_page(client, params, offset)]
+        while True:
+            for batch in pages:
+                if not batch:
+                    return all_records
+                all_records.extend(batch)
+                if len(batch) < PLACES_PAGE_SIZE:
+                    return all_records
+                offset += PLACES_PAGE_SIZE
+            # SODA doesn't report a total, so request the next few pages
+            # together; pages past the end come back empty and are ignored.
+            offsets = [offset + i * PLACES_PAGE_SIZE for i in range(PLACES_SPECULATIVE_PAGES)]
+            pages = await asyncio.gather(*(_fetch_places_page(client, params, o) for o in offsets))
+
+
 def fetch_places_data(
     measures: list[Measure],
     year: int = DEFAULT_PLACES_YEAR,
@@ -110,36 +154,19 @@ def fetch_places_data(
     data_value_col = "data_value"
     datavaluetypeid = "AgeAdjPrv" if prevalence_type == "age_adjusted" else "CrdPrv"
 
-    all_records: list[dict] = []
-    limit = 10000
-    offset = 0
-
-    while True:
-        params: dict[str, str | int] = {
-            "$where": (
-                f"stateabbr='{MICHIGAN_STATE_ABBR}' "
-                f"AND year='{year}' "
-                f"AND datavaluetypeid='{datavaluetypeid}' "
-                f"AND locationname != '{MICHIGAN_STATE_ABBR}' "
-                f"AND measureid in({','.join(repr(m) for m in measure_ids)})"
-            ),
-            "$select": f"locationname,measureid,{data_value_col}",
-            "$limit": limit,
-            "$offset": offset,
-        }
-
-        resp = httpx.get(PLACES_BASE_URL, params=params, timeout=30)
-        if resp.status_code != 200:
-            raise PlacesAPIError(resp.status_code, resp.text[:200])
-
-        batch = resp.json()
-        if not batch:
-            break
-        all_records.extend(batch)
-        if len(batch) < limit:
-            break
-        offset += limit
-
+    params: dict[str, str | int] = {
+        "$where": (
+            f"stateabbr='{MICHIGAN_STATE_ABBR}' "
+            f"AND year='{year}' "
+            f"AND datavaluetypeid='{datavaluetypeid}' "
+            f"AND locationname != '{MICHIGAN_STATE_ABBR}' "
+            f"AND measureid in({','.join(repr(m) for m in measure_ids)})"
+        ),
+        "$select": f"locationname,measureid,{data_value_col}",
+        "$order": "locationname,measureid",  # stable order across pages
+        "$limit": PLACES_PAGE_SIZE,
+    }
+    all_records = asyncio.run(_fetch_places_pages(params))
     return _pivot_rows(all_records, measures, data_value_col)
 
 
@@ -149,17 +176,19 @@ def _pivot_rows(
     value_col: str,
 ) -> list[dict]:
     """Pivot long CDC rows into one row per county with measures as columns."""
+    is_number = NUMERIC_RE.fullmatch
     by_county: dict[str, dict] = {}
     for rec in records:
         county = clean_county_name(rec.get("locationname", ""))
-        if county not in by_county:
-            by_county[county] = {"locationname": county}
-        mid = rec.get("measureid", "")
+        row = by_county.get(county)
+        if row is None:
+            row = by_county[county] = {"locationname": county}
         raw = rec.get(value_col, "")
-        try:
-            by_county[county][mid] = str(round(float(raw) / 100, 4))
-        except (ValueError, TypeError):
-            by_county[county][mid] = raw
+        # Percentages become proportions; blanks and footnote text pass through
+        if isinstance(raw, (int, float)) or (isinstance(raw, str) and is_number(raw)):
+            row[rec.get("measureid", "")] = str(round(float(raw) / 100, 4))
+        else:
+            row[rec.get("measureid", "")] = raw
 
     return sorted(by_county.values(), key=lambda r: r.get("locationname", ""))
 
@@ -175,31 +204,13 @@ def write_places_csv(
     sort_col: str | None = None,
     header: bool = True,
 ) -> int:
-    if county_filter:
-        filt = county_filter.lower()
-        rows = [r for r in rows if filt in r.get("locationname", "").lower()]
-
-    if not rows:
-        return 0
-
-    if sort_col:
-        target_id = None
-        for m in measures:
-            if m.label.lower() == sort_col.lower():
-                target_id = m.measureid
-                break
-        if target_id is None:
-            target_id = sort_col
-        rows.sort(key=lambda r: float(r.get(target_id, 0) or 0), reverse=True)
-
-    if header:
-        columns = ["County"] + [m.label for m in measures]
-        writer.writerow(columns)
-
-    for row in rows:
-        csv_row = [row.get("locationname", "")]
-        for m in measures:
-            csv_row.append(row.get(m.measureid, ""))
-        writer.writerow(csv_row)
-
-    return len(rows)
+    return write_measure_csv(
+        rows,
+        measures,
+        writer,
+        id_attr="measureid",
+        county_key="locationname",
+        county_filter=county_filter,
+        sort_col=sort_col,
+        header=header,
+    )
@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+import csv
+from collections.abc import Mapping
+from dataclasses import dataclass
+from functools import lru_cache
+from types import MappingProxyType
+
+import numpy as np
+
+# ── Per-county measure CSV ───────────────────────────────────────────────────
+#
+# Every non-Census source produces one dict per county keyed by measure id,
+# and writes it the same way: optional county filter, optional descending
+# sort on one measure, then a "County" column followed by one column per
+# measure.
+
+
+@dataclass(frozen=True)
+class CSVLayout:
+    header: tuple[str, ...]
+    ids: tuple[str, ...]
+    blanks: tuple[str, ...]  # per-column default for rows missing a measure
+    label_to_id: Mapping[str, str]  # read-only: layouts are cached and shared
+
+
+@lru_cache(maxsize=32)
+def csv_layout(measures: tuple, id_attr: str = "measure_id") -> CSVLayout:
+    """Column layout for a measure selection, built once per distinct selection."""
+    ids = tuple(getattr(m, id_attr) for m in measures)
+    return CSVLayout(
+        header=("County", *(m.label for m in measures)),
+        ids=ids,
+        blanks=("",) * len(measures),
+        label_to_id=MappingProxyType({m.label.lower(): mid for m, mid in zip(measures, ids)}),
+    )
+
+
+def write_measure_csv(
+    rows: list[dict],
+    measures: list,
+    writer: csv.writer,
+    *,
+    id_attr: str = "measure_id",
+    county_key: str = "county",
+    county_filter: str | None = None,
+    sort_col: str | None = None,
+    header: bool = True,
+) -> int:
+    """Write per-county measure rows as CSV. Returns number of data rows written."""
+    if county_filter:
+        filt = county_filter.lower()
+        rows = [r for r in rows if filt in r.get(county_key, "").lower()]
+
+    if not rows:
+        return 0
+
+    layout = csv_layout(tuple(measures), id_attr)
+    if sort_col:
+        target_id = layout.label_to_id.get(sort_col.lower(), sort_col)
+        # Materialize the keys once, then a stable descending argsort
+        keys = np.fromiter((float(r.get(target_id, 0) or 0) for r in rows), dtype=np.float64, count=len(rows))
+        rows = [rows[i] for i in np.argsort(-keys, kind="stable")]
+
+    if header:
+        writer.writerow(layout.header)
+
+    ids, blanks = layout.ids, layout.blanks
+    writer.writerows([row.get(county_key, ""), *map(row.get, ids, blanks)] for row in rows)
+
+    return len(rows)
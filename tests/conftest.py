@@ -1,9 +1,19 @@
 from __future__ import annotations
 
+import csv
+import functools
+import io
+import json
+from collections.abc import Sequence
+
+import numpy as np
 import pytest
 import respx
 from httpx import Response
+from click.testing import CliRunner
+from typer.main import get_command
 
+from acs_cli.cli import app
 from acs_cli.census_api.client import ACS_BASE_URL, MICHIGAN_FIPS, ZCTA_FIELD
 from acs_cli.places_api.client import PLACES_BASE_URL
 from acs_cli.cms_api.client import HOSPITAL_BASE_URL
@@ -14,6 +24,8 @@ from acs_cli.hrsa_api.ahrf import AHRF_HP_FILENAME
 
 # ── Helpers ──────────────────────────────────────────────────────────────────
 
+JSON_HEADERS = {"content-type": "application/json"}
+
 MOCK_COUNTIES = [
     ("Washtenaw County, Michigan", "161"),
     ("Wayne County, Michigan", "163"),
@@ -21,12 +33,41 @@ MOCK_COUNTIES = [
 ]
 
 
+def count_lines(buf) -> int:
+    """Count newlines in a bytes-like buffer (e.g. an mmap) without copying it."""
+    n = pos = 0
+    while (pos := buf.find(b"\n", pos) + 1) > 0:
+        n += 1
+    return n
+
+
+def parse_csv(text: str) -> list[list[str]]:
+    return list(csv.reader(text.splitlines()))
+
+
+def parse_csv_fast(text: str) -> list[list[str]]:
+    """Split unquoted CSV; only for listings whose fields never contain commas."""
+    return [ln.split(",") for ln in text.splitlines() if ln]
+
+
+def header_index(rows: list[list[str]]) -> dict[str, int]:
+    """Map each header column name to its index."""
+    return {col: i for i, col in enumerate(rows[0])}
+
+
+def assert_descending(rows: list[list[str]], idx: int) -> None:
+    """Assert the non-empty numeric values in column ``idx`` never increase."""
+    # One np.array call parses the strings in C rather than float() per cell
+    col = np.array([r[idx] for r in rows[1:] if r[idx]], dtype=np.float64)
+    assert np.all(np.diff(col) <= 0), col
+
+
 def census_url(year: int = 2024) -> str:
     return ACS_BASE_URL.format(year=year)
 
 
 def build_census_response(
-    variable_codes: list[str],
+    variable_codes: Sequence[str],
     counties: list[tuple[str, str]] | None = None,
     values_fn=None,
 ) -> list[list[str]]:
@@ -45,7 +86,7 @@ def build_census_response(
             counter["n"] += 1
             return str(counter["n"])
 
-    header = ["NAME"] + variable_codes + ["state", "county"]
+    header = ["NAME", *variable_codes, "state", "county"]
     rows = []
     for ci, (name, fips) in enumerate(counties):
         row = [name] + [values_fn(ci, c) for c in variable_codes] + [MICHIGAN_FIPS, fips]
@@ -55,6 +96,48 @@ def build_census_response(
 
 # ── Fixtures ─────────────────────────────────────────────────────────────────
 
+# Plain, wide output so nothing in the CLI spends time on terminal styling
+CLI_ENV = {"NO_COLOR": "1", "TERM": "dumb", "COLUMNS": "200"}
+
+
+@pytest.fixture(scope="session")
+def runner() -> CliRunner:
+    return CliRunner(env=CLI_ENV)
+
+
+@pytest.fixture(scope="session")
+def compiled_app():
+    """The app's Click command, resolved once instead of on every invoke."""
+    return get_command(app)
+
+
+@pytest.fixture(scope="session")
+def _respx_session():
+    with respx.mock(assert_all_called=False) as router:
+        yield router
+
+
+@pytest.fixture(autouse=True)
+def respx_router(_respx_session):
+    """Suite-wide respx router; routes and call stats are dropped after each test.
+
+    Tests that enter their own ``respx.mock`` still work: requests the shared
+    router has no route for fall through to the test's router.
+    """
+    yield _respx_session
+    _respx_session.clear()
+    _respx_session.reset()
+
+
+@pytest.fixture(autouse=True)
+def isolated_cache(monkeypatch, tmp_path):
+    """Give every test an empty response cache so mocks are always hit."""
+    cache_dir = tmp_path / "response_cache"
+    monkeypatch.setattr("acs_cli.cache.CACHE_DIR", cache_dir)
+    monkeypatch.delenv("ACS_CLI_NO_CACHE", raising=False)
+    return cache_dir
+
+
 @pytest.fixture()
 def api_key(monkeypatch):
     """Ensure CENSUS_API_KEY is set for every test that needs it."""
@@ -85,7 +168,7 @@ def mock_census(api_key):
 
         def _register(
             year: int = 2024,
-            codes: list[str] | None = None,
+            codes: Sequence[str] | None = None,
             response: list[list[str]] | None = None,
             counties: list[tuple[str, str]] | None = None,
         ):
@@ -111,7 +194,7 @@ MOCK_ZCTAS = [
 
 
 def build_zcta_census_response(
-    variable_codes: list[str],
+    variable_codes: Sequence[str],
     zctas: list[tuple[str, str]] | None = None,
     values_fn=None,
 ) -> list[list[str]]:
@@ -126,7 +209,7 @@ def build_zcta_census_response(
             counter["n"] += 1
             return str(counter["n"])
 
-    header = ["NAME"] + variable_codes + [ZCTA_FIELD]
+    header = ["NAME", *variable_codes, ZCTA_FIELD]
     rows = []
     for zi, (name, code) in enumerate(zctas):
         row = [name] + [values_fn(zi, c) for c in variable_codes] + [code]
@@ -141,7 +224,7 @@ def mock_census_zcta(api_key):
 
         def _register(
             year: int = 2024,
-            codes: list[str] | None = None,
+            codes: Sequence[str] | None = None,
             response: list[list[str]] | None = None,
             zctas: list[tuple[str, str]] | None = None,
         ):
@@ -171,41 +254,64 @@ def build_places_response(
     """Build a CDC PLACES SODA API response (list of dicts, long format)."""
     if counties is None:
         counties = MOCK_PLACES_COUNTIES
-    records = []
-    for ci, county in enumerate(counties):
-        for mi, mid in enumerate(measure_ids):
-            records.append({
-                "locationname": county,
-                "measureid": mid,
-                value_col: str(round(base_value + ci * 2 + mi * 0.5, 1)),
-            })
-    return records
+    # One value column per measure, aligned with counties
+    columns = [
+        (mid, [str(round(base_value + ci * 2 + mi * 0.5, 1)) for ci in range(len(counties))])
+        for mi, mid in enumerate(measure_ids)
+    ]
+    return [
+        {"locationname": county, "measureid": mid, value_col: value}
+        for mid, values in columns
+        for county, value in zip(counties, values)
+    ]
+
+
+def places_csv(records: list[dict], value_col: str = "data_value") -> str:
+    """Render PLACES records the way the SODA ``.csv`` endpoint returns them."""
+    buf = io.StringIO()
+    writer = csv.DictWriter(buf, fieldnames=["locationname", "measureid", value_col], extrasaction="ignore")
+    writer.writeheader()
+    writer.writerows(records)
+    return buf.getvalue()
+
+
+@functools.lru_cache(maxsize=None)
+def places_body(
+    measure_ids: tuple[str, ...],
+    counties: tuple[str, ...] | None = None,
+    value_col: str = "data_value",
+) -> bytes:
+    """Encoded mock PLACES CSV, built once per distinct measure/county selection."""
+    records = build_places_response(list(measure_ids), counties=counties, value_col=value_col)
+    return places_csv(records, value_col).encode()
 
 
 @pytest.fixture()
-def mock_places():
-    """Activate respx and return a helper to register mock PLACES responses."""
-    with respx.mock(assert_all_called=False) as router:
-
-        def _register(
-            measure_ids: list[str] | None = None,
-            response: list[dict] | None = None,
-            counties: list[str] | None = None,
-            status_code: int = 200,
-            value_col: str = "data_value",
-        ):
-            if measure_ids is None:
-                measure_ids = ["DIABETES"]
-            if response is None and status_code == 200:
-                response = build_places_response(
-                    measure_ids, counties=counties, value_col=value_col,
-                )
-            route = router.get(PLACES_BASE_URL).mock(
-                return_value=Response(status_code, json=response or [])
+def mock_places(respx_router):
+    """Return a helper to register mock PLACES responses on the shared router."""
+
+    def _register(
+        measure_ids: Sequence[str] | None = None,
+        response: list[dict] | None = None,
+        counties: list[str] | None = None,
+        status_code: int = 200,
+        value_col: str = "data_value",
+    ):
+        if measure_ids is None:
+            measure_ids = ["DIABETES"]
+        if response is None and status_code == 200:
+            body = places_body(
+                tuple(measure_ids), tuple(counties) if counties else None, value_col,
             )
-            return route
+        else:
+            body = places_csv(response or [], value_col).encode()
+        return respx_router.get(PLACES_BASE_URL).mock(
+            return_value=Response(
+                status_code, content=body, headers={"content-type": "text/csv"},
+            )
+        )
 
-        yield _register
+    return _register
 
 
 # ── CMS helpers ──────────────────────────────────────────────────────────────
@@ -233,6 +339,11 @@ def build_hospital_response(
     return {"results": results}
 
 
+@functools.cache
+def _default_hospital_body() -> bytes:
+    return json.dumps(build_hospital_response()).encode()
+
+
 @pytest.fixture()
 def mock_cms():
     """Activate respx and return a helper to register CMS hospital API mocks."""
@@ -243,10 +354,10 @@ def mock_cms():
             hospital_status: int = 200,
         ):
             if hospital_response is None and hospital_status == 200:
-                hospital_response = build_hospital_response()
-            router.get(HOSPITAL_BASE_URL).mock(
-                return_value=Response(hospital_status, json=hospital_response or {"results": []})
-            )
+                response = Response(200, content=_default_hospital_body(), headers=JSON_HEADERS)
+            else:
+                response = Response(hospital_status, json=hospital_response or {"results": []})
+            router.get(HOSPITAL_BASE_URL).mock(return_value=response)
 
         yield _register
 
@@ -275,6 +386,17 @@ def build_hpsa_response(
     return {"features": features, "exceededTransferLimit": False}
 
 
+@functools.cache
+def _default_hpsa_body() -> bytes:
+    return json.dumps(build_hpsa_response()).encode()
+
+
+def _hpsa_mock_response(response: dict | None, status: int) -> Response:
+    if response is None and status == 200:
+        return Response(200, content=_default_hpsa_body(), headers=JSON_HEADERS)
+    return Response(status, json=response or {"features": []})
+
+
 PC_HPSA_URL = HRSA_BASE_URL + "/9/query"
 MH_HPSA_URL = HRSA_BASE_URL + "/5/query"
 
@@ -290,16 +412,8 @@ def mock_hrsa():
             pc_status: int = 200,
             mh_status: int = 200,
         ):
-            if pc_response is None and pc_status == 200:
-                pc_response = build_hpsa_response()
-            router.get(PC_HPSA_URL).mock(
-                return_value=Response(pc_status, json=pc_response or {"features": []})
-            )
-            if mh_response is None and mh_status == 200:
-                mh_response = build_hpsa_response()
-            router.get(MH_HPSA_URL).mock(
-                return_value=Response(mh_status, json=mh_response or {"features": []})
-            )
+            router.get(PC_HPSA_URL).mock(return_value=_hpsa_mock_response(pc_response, pc_status))
+            router.get(MH_HPSA_URL).mock(return_value=_hpsa_mock_response(mh_response, mh_status))
 
         yield _register
 
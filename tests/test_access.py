@@ -2,68 +2,100 @@
 
 from __future__ import annotations
 
-import csv
-import io
+import asyncio
+import mmap
 
 import pytest
 import respx
 from httpx import Response
-from typer.testing import CliRunner
 
-from acs_cli.cli import app
 from acs_cli.cms_api import ACCESS_MEASURES, resolve_access_measures
 from acs_cli.cms_api.client import (
     HOSPITAL_BASE_URL,
+    HOSPITAL_PAGE_SIZE,
+    MAX_CONCURRENT_REQUESTS,
     CMSAPIError,
     _aggregate_hospitals_by_county,
     fetch_hospital_data,
 )
 from acs_cli.hrsa_api import HPSA_MEASURES, resolve_hpsa_measures
 from acs_cli.hrsa_api.client import (
+    HPSA_PAGE_SIZE,
     HRSAAPIError,
     _aggregate_hpsa_by_county,
     fetch_hpsa_data,
+    fetch_shortage_data,
 )
 from tests.conftest import (
     MOCK_ACCESS_COUNTIES,
+    assert_descending,
     build_hospital_response,
     build_hpsa_response,
+    count_lines,
+    header_index,
+    parse_csv,
+    parse_csv_fast,
     PC_HPSA_URL,
 )
 
-runner = CliRunner()
+ACCESS_MEASURE_COUNT = sum(len(ms) for ms in ACCESS_MEASURES.values())
+HPSA_MEASURE_COUNT = sum(len(ms) for ms in HPSA_MEASURES.values())
+ACCESS_GROUP_NAMES = frozenset(ACCESS_MEASURES) | frozenset(HPSA_MEASURES)
+
+
+def make_hospital_records(counties, types, emergency, ratings, birthing) -> list[dict]:
+    """Zip per-field columns into CMS hospital records."""
+    return [
+        {
+            "countyparish": county,
+            "hospital_type": h_type,
+            "emergency_services": er,
+            "hospital_overall_rating": rating,
+            "meets_criteria_for_birthing_friendly_designation": bf,
+        }
+        for county, h_type, er, rating, bf in zip(
+            counties, types, emergency, ratings, birthing, strict=True
+        )
+    ]
 
 
-def parse_csv(text: str) -> list[list[str]]:
-    return list(csv.reader(io.StringIO(text)))
+def make_hpsa_features(fips, scores, underserved) -> list[dict]:
+    """Zip per-field columns into HRSA HPSA features."""
+    return [
+        {
+            "attributes": {
+                "CMN_STATE_COUNTY_FIPS_CD": f,
+                "HPSA_SCORE": score,
+                "HPSA_ESTIMATED_UNDERSERVED_POP": pop,
+            }
+        }
+        for f, score, pop in zip(fips, scores, underserved, strict=True)
+    ]
 
 
 # ── access-topics command ───────────────────────────────────────────────────
 
 
+@pytest.fixture(scope="class")
+def access_topics_rows(runner, compiled_app) -> list[list[str]]:
+    result = runner.invoke(compiled_app, ["access-topics"])
+    assert result.exit_code == 0
+    return parse_csv_fast(result.stdout)
+
+
 class TestAccessTopicsCommand:
-    def test_lists_all_groups(self):
-        result = runner.invoke(app, ["access-topics"])
-        assert result.exit_code == 0
-        rows = parse_csv(result.stdout)
+    def test_lists_all_groups(self, access_topics_rows):
+        rows = access_topics_rows
         header = rows[0]
         assert header == ["Source", "Group", "Measure ID", "Label", "Description"]
         group_names = {r[1] for r in rows[1:]}
-        expected_groups = set(ACCESS_MEASURES.keys()) | set(HPSA_MEASURES.keys())
-        assert group_names == expected_groups
+        assert group_names == ACCESS_GROUP_NAMES
 
-    def test_row_count_matches_measures(self):
-        result = runner.invoke(app, ["access-topics"])
-        rows = parse_csv(result.stdout)
-        expected = sum(len(ms) for ms in ACCESS_MEASURES.values()) + sum(
-            len(ms) for ms in HPSA_MEASURES.values()
-        )
-        assert len(rows) - 1 == expected
+    def test_row_count_matches_measures(self, access_topics_rows):
+        assert len(access_topics_rows) - 1 == ACCESS_MEASURE_COUNT + HPSA_MEASURE_COUNT
 
-    def test_measure_ids_present(self):
-        result = runner.invoke(app, ["access-topics"])
-        rows = parse_csv(result.stdout)
-        ids = {r[2] for r in rows[1:]}
+    def test_measure_ids_present(self, access_topics_rows):
+        ids = {r[2] for r in access_topics_rows[1:]}
         assert "hospital_count" in ids
         assert "avg_hospital_rating" in ids
         assert "pc_hpsa_count" in ids
@@ -74,20 +106,20 @@ class TestAccessTopicsCommand:
 
 
 class TestAccessCommand:
-    def test_no_group_argument(self):
-        result = runner.invoke(app, ["access"])
+    def test_no_group_argument(self, runner, compiled_app):
+        result = runner.invoke(compiled_app, ["access"])
         assert result.exit_code == 1
         assert "Provide access group" in result.stderr
 
-    def test_unknown_group(self):
+    def test_unknown_group(self, runner, compiled_app):
         with respx.mock:
-            result = runner.invoke(app, ["access", "nonexistent_group"])
+            result = runner.invoke(compiled_app, ["access", "nonexistent_group"])
         assert result.exit_code == 1
         assert "Unknown access group" in result.stderr
 
-    def test_hospital_access_group(self, mock_cms):
+    def test_hospital_access_group(self, runner, compiled_app, mock_cms):
         mock_cms()
-        result = runner.invoke(app, ["access", "hospital_access"])
+        result = runner.invoke(compiled_app, ["access", "hospital_access"])
         assert result.exit_code == 0
         rows = parse_csv(result.stdout)
         header = rows[0]
@@ -96,9 +128,9 @@ class TestAccessCommand:
         assert "Acute Care Hospitals" in header
         assert len(rows) > 1
 
-    def test_hrsa_shortage_group(self, mock_hrsa):
+    def test_hrsa_shortage_group(self, runner, compiled_app, mock_hrsa):
         mock_hrsa()
-        result = runner.invoke(app, ["access", "primary_care_shortage"])
+        result = runner.invoke(compiled_app, ["access", "primary_care_shortage"])
         assert result.exit_code == 0
         rows = parse_csv(result.stdout)
         header = rows[0]
@@ -106,10 +138,10 @@ class TestAccessCommand:
         assert "Primary Care HPSA Count" in header
         assert len(rows) > 1
 
-    def test_all_groups(self, mock_cms, mock_hrsa):
+    def test_all_groups(self, runner, compiled_app, mock_cms, mock_hrsa):
         mock_cms()
         mock_hrsa()
-        result = runner.invoke(app, ["access", "all"])
+        result = runner.invoke(compiled_app, ["access", "all"])
         assert result.exit_code == 0
         rows = parse_csv(result.stdout)
         header = rows[0]
@@ -117,57 +149,51 @@ class TestAccessCommand:
         assert "Primary Care HPSA Count" in header
         assert len(rows) > 1
 
-    def test_county_filter(self, mock_cms):
+    def test_county_filter(self, runner, compiled_app, mock_cms):
         mock_cms()
-        result = runner.invoke(app, ["access", "hospital_access", "--county", "Wayne"])
+        result = runner.invoke(compiled_app, ["access", "hospital_access", "--county", "Wayne"])
         assert result.exit_code == 0
         rows = parse_csv(result.stdout)
         assert len(rows) == 2  # header + 1 county
         assert "Wayne" in rows[1][0]
 
-    def test_county_filter_no_match(self, mock_cms):
+    def test_county_filter_no_match(self, runner, compiled_app, mock_cms):
         mock_cms()
-        result = runner.invoke(app, ["access", "hospital_access", "--county", "Nonexistent"])
+        result = runner.invoke(compiled_app, ["access", "hospital_access", "--county", "Nonexistent"])
         assert "No matching rows" in result.stderr
 
-    def test_sort_option(self, mock_hrsa):
+    def test_sort_option(self, runner, compiled_app, mock_hrsa):
         mock_hrsa()
         result = runner.invoke(
-            app, ["access", "primary_care_shortage", "--sort", "Primary Care HPSA Count"]
+            compiled_app, ["access", "primary_care_shortage", "--sort", "Primary Care HPSA Count"]
         )
         assert result.exit_code == 0
         rows = parse_csv(result.stdout)
-        header = rows[0]
-        idx = header.index("Primary Care HPSA Count")
-        values = [float(r[idx]) for r in rows[1:] if r[idx]]
-        assert values == sorted(values, reverse=True)
+        idx = header_index(rows)["Primary Care HPSA Count"]
+        assert_descending(rows, idx)
 
-    def test_output_to_file(self, mock_cms, tmp_path):
+    def test_output_to_file(self, runner, compiled_app, mock_cms, tmp_path):
         mock_cms()
-        outfile = str(tmp_path / "access.csv")
-        result = runner.invoke(app, ["access", "hospital_access", "--output", outfile])
+        outfile = tmp_path / "access.csv"
+        result = runner.invoke(compiled_app, ["access", "hospital_access", "--output", str(outfile)])
         assert result.exit_code == 0
         assert "Wrote CSV" in result.stderr
-        with open(outfile) as f:
-            rows = list(csv.reader(f))
-        assert rows[0][0] == "County"
-        assert len(rows) > 1
-
-    def test_cms_api_error(self):
+        with open(outfile, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            assert mm[:7] == b"County,"
+            assert count_lines(mm) > 1
+
+    @pytest.mark.parametrize(
+        "url, group",
+        [
+            (HOSPITAL_BASE_URL, "hospital_access"),
+            (PC_HPSA_URL, "primary_care_shortage"),
+        ],
+        ids=["cms", "hrsa"],
+    )
+    def test_api_error(self, runner, compiled_app, url, group):
         with respx.mock:
-            respx.get(HOSPITAL_BASE_URL).mock(
-                return_value=Response(500, json={"results": []})
-            )
-            result = runner.invoke(app, ["access", "hospital_access"])
-        assert result.exit_code == 1
-        assert "500" in result.stderr
-
-    def test_hrsa_api_error(self):
-        with respx.mock:
-            respx.get(PC_HPSA_URL).mock(
-                return_value=Response(500, text="Server Error")
-            )
-            result = runner.invoke(app, ["access", "primary_care_shortage"])
+            respx.get(url).mock(return_value=Response(500, text="Server Error"))
+            result = runner.invoke(compiled_app, ["access", group])
         assert result.exit_code == 1
         assert "500" in result.stderr
 
@@ -182,37 +208,20 @@ class TestCMSClient:
 
     def test_resolve_access_measures_all(self):
         result = resolve_access_measures(["all"])
-        expected = sum(len(ms) for ms in ACCESS_MEASURES.values())
-        assert len(result) == expected
+        assert len(result) == ACCESS_MEASURE_COUNT
 
     def test_resolve_access_measures_unknown_group(self):
         with pytest.raises(ValueError, match="Unknown access group"):
             resolve_access_measures(["bogus"])
 
     def test_aggregate_hospitals_by_county(self):
-        records = [
-            {
-                "countyparish": "WAYNE",
-                "hospital_type": "Acute Care Hospitals",
-                "emergency_services": "Yes",
-                "hospital_overall_rating": "4",
-                "meets_criteria_for_birthing_friendly_designation": "Y",
-            },
-            {
-                "countyparish": "WAYNE",
-                "hospital_type": "Critical Access Hospitals",
-                "emergency_services": "No",
-                "hospital_overall_rating": "3",
-                "meets_criteria_for_birthing_friendly_designation": "N",
-            },
-            {
-                "countyparish": "OAKLAND",
-                "hospital_type": "Acute Care Hospitals",
-                "emergency_services": "Yes",
-                "hospital_overall_rating": "5",
-                "meets_criteria_for_birthing_friendly_designation": "Y",
-            },
-        ]
+        records = make_hospital_records(
+            counties=["WAYNE", "WAYNE", "OAKLAND"],
+            types=["Acute Care Hospitals", "Critical Access Hospitals", "Acute Care Hospitals"],
+            emergency=["Yes", "No", "Yes"],
+            ratings=["4", "3", "5"],
+            birthing=["Y", "N", "Y"],
+        )
         result = _aggregate_hospitals_by_county(records)
         assert len(result) == 2
         # Sorted alphabetically
@@ -231,23 +240,89 @@ class TestCMSClient:
         assert oakland["hospital_count"] == 1
         assert oakland["avg_hospital_rating"] == "5.0"
 
-    def test_fetch_hospital_data_error(self):
+    def test_aggregate_hospitals_rating_types(self):
+        records = make_hospital_records(
+            counties=["WAYNE"] * 5,
+            types=["Acute Care Hospitals"] * 5,
+            emergency=["Yes"] * 5,
+            ratings=[4, 2.0, "3", "²", "Not Available"],
+            birthing=["Y"] * 5,
+        )
+        (wayne,) = _aggregate_hospitals_by_county(records)
+        assert wayne["hospital_count"] == 5
+        assert wayne["avg_hospital_rating"] == "3.0"
+
+    def test_fetch_hospital_data_success(self, respx_router):
+        respx_router.get(HOSPITAL_BASE_URL).mock(
+            return_value=Response(200, json=build_hospital_response())
+        )
+        result = fetch_hospital_data()
+        assert len(result) == len(MOCK_ACCESS_COUNTIES)
+        assert all(r["state"] == "MI" for r in result)
+
+    def test_fetch_hospital_data_uses_count_for_remaining_pages(self):
+        def _page(request):
+            offset = int(request.url.params["offset"])
+            size = HOSPITAL_PAGE_SIZE if offset < 1000 else 20
+            results = [{"state": "MI", "offset": offset}] * size
+            return Response(200, json={"count": 1020, "results": results})
+
         with respx.mock:
-            respx.get(HOSPITAL_BASE_URL).mock(
-                return_value=Response(500, text="Internal Server Error")
-            )
-            with pytest.raises(CMSAPIError, match="500"):
-                fetch_hospital_data()
+            route = respx.get(HOSPITAL_BASE_URL).mock(side_effect=_page)
+            result = fetch_hospital_data()
+        assert len(result) == 1020
+        assert route.call_count == 3
+        assert [r["offset"] for r in result[::HOSPITAL_PAGE_SIZE]] == [0, 500, 1000]
+
+    def test_fetch_hospital_data_bounds_in_flight_pages(self):
+        in_flight = peak = 0
+        n_pages = 2 * MAX_CONCURRENT_REQUESTS + 1
+
+        async def _slow(request):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            results = [{"state": "MI"}] * HOSPITAL_PAGE_SIZE
+            return Response(200, json={"count": n_pages * HOSPITAL_PAGE_SIZE, "results": results})
 
-    def test_fetch_hospital_data_success(self):
-        response = build_hospital_response()
         with respx.mock:
-            respx.get(HOSPITAL_BASE_URL).mock(
-                return_value=Response(200, json=response)
-            )
+            route = respx.get(HOSPITAL_BASE_URL).mock(side_effect=_slow)
             result = fetch_hospital_data()
-        assert len(result) == len(MOCK_ACCESS_COUNTIES)
-        assert all(r["state"] == "MI" for r in result)
+        assert route.call_count == n_pages
+        assert peak == MAX_CONCURRENT_REQUESTS
+        assert len(result) == n_pages * HOSPITAL_PAGE_SIZE
+
+    def test_fetch_hospital_data_page_error_propagates(self):
+        def _page(request):
+            if request.url.params["offset"] == "1000":
+                return Response(500, text="Server Error")
+            results = [{"state": "MI"}] * HOSPITAL_PAGE_SIZE
+            return Response(200, json={"count": 5 * HOSPITAL_PAGE_SIZE, "results": results})
+
+        with respx.mock:
+            respx.get(HOSPITAL_BASE_URL).mock(side_effect=_page)
+            with pytest.raises(CMSAPIError, match="500"):
+                fetch_hospital_data()
+
+
+# ── Client error handling ───────────────────────────────────────────────────
+
+
+@pytest.mark.parametrize(
+    "url, fetch, exc",
+    [
+        (HOSPITAL_BASE_URL, fetch_hospital_data, CMSAPIError),
+        (PC_HPSA_URL, lambda: fetch_hpsa_data("/9/query"), HRSAAPIError),
+    ],
+    ids=["cms", "hrsa"],
+)
+def test_fetch_data_error(url, fetch, exc):
+    with respx.mock:
+        respx.get(url).mock(return_value=Response(500, text="Server Error"))
+        with pytest.raises(exc, match="500"):
+            fetch()
 
 
 # ── HRSA client unit tests ─────────────────────────────────────────────────
@@ -260,37 +335,18 @@ class TestHRSAClient:
 
     def test_resolve_hpsa_measures_all(self):
         result = resolve_hpsa_measures(["all"])
-        expected = sum(len(ms) for ms in HPSA_MEASURES.values())
-        assert len(result) == expected
+        assert len(result) == HPSA_MEASURE_COUNT
 
     def test_resolve_hpsa_measures_unknown_group(self):
         with pytest.raises(ValueError, match="Unknown shortage group"):
             resolve_hpsa_measures(["bogus"])
 
     def test_aggregate_hpsa_by_county(self):
-        features = [
-            {
-                "attributes": {
-                    "CMN_STATE_COUNTY_FIPS_CD": "26163",
-                    "HPSA_SCORE": 20,
-                    "HPSA_ESTIMATED_UNDERSERVED_POP": 15000,
-                }
-            },
-            {
-                "attributes": {
-                    "CMN_STATE_COUNTY_FIPS_CD": "26163",
-                    "HPSA_SCORE": 10,
-                    "HPSA_ESTIMATED_UNDERSERVED_POP": 5000,
-                }
-            },
-            {
-                "attributes": {
-                    "CMN_STATE_COUNTY_FIPS_CD": "26125",
-                    "HPSA_SCORE": 18,
-                    "HPSA_ESTIMATED_UNDERSERVED_POP": 8000,
-                }
-            },
-        ]
+        features = make_hpsa_features(
+            fips=["26163", "26163", "26125"],
+            scores=[20, 10, 18],
+            underserved=[15000, 5000, 8000],
+        )
         result = _aggregate_hpsa_by_county(features, "pc")
         assert len(result) == 2
 
@@ -305,32 +361,56 @@ class TestHRSAClient:
         assert oakland["pc_hpsa_max_score"] == "18.0"
 
     def test_aggregate_hpsa_unknown_fips(self):
-        features = [
-            {
-                "attributes": {
-                    "CMN_STATE_COUNTY_FIPS_CD": "99999",
-                    "HPSA_SCORE": 20,
-                    "HPSA_ESTIMATED_UNDERSERVED_POP": 5000,
-                }
-            },
-        ]
+        features = make_hpsa_features(fips=["99999"], scores=[20], underserved=[5000])
         result = _aggregate_hpsa_by_county(features, "mh")
         assert len(result) == 0
 
-    def test_fetch_hpsa_data_error(self):
-        with respx.mock:
-            respx.get(PC_HPSA_URL).mock(
-                return_value=Response(500, text="Server Error")
-            )
-            with pytest.raises(HRSAAPIError, match="500"):
-                fetch_hpsa_data("/9/query")
-
-    def test_fetch_hpsa_data_success(self):
-        response = build_hpsa_response()
-        with respx.mock:
-            respx.get(PC_HPSA_URL).mock(
-                return_value=Response(200, json=response)
-            )
-            result = fetch_hpsa_data("/9/query")
+    def test_fetch_hpsa_data_success(self, respx_router):
+        respx_router.get(PC_HPSA_URL).mock(
+            return_value=Response(200, json=build_hpsa_response())
+        )
+        result = fetch_hpsa_data("/9/query")
         assert len(result) == 3
         assert all("attributes" in f for f in result)
+
+    def test_fetch_hpsa_data_pages_past_transfer_limit(self):
+        # Two full pages then a short one; the speculative batch over-asks
+        def _page(request):
+            page = int(request.url.params["resultOffset"]) // HPSA_PAGE_SIZE
+            if page > 2:
+                return Response(200, json={"features": []})
+            body = build_hpsa_response(["26163"] * (HPSA_PAGE_SIZE if page < 2 else 5))
+            body["exceededTransferLimit"] = page < 2
+            return Response(200, json=body)
+
+        with respx.mock:
+            respx.get(PC_HPSA_URL).mock(side_effect=_page)
+            result = fetch_hpsa_data("/9/query")
+        assert len(result) == 2 * HPSA_PAGE_SIZE + 5
+
+    def test_fetch_shortage_data_reduces_pages_incrementally(self):
+        def _page(request):
+            page = int(request.url.params["resultOffset"]) // HPSA_PAGE_SIZE
+            if page == 0:
+                body = build_hpsa_response(["26163"] * HPSA_PAGE_SIZE)
+                for feat in body["features"]:
+                    feat["attributes"].update(HPSA_SCORE=10, HPSA_ESTIMATED_UNDERSERVED_POP=1)
+                body["exceededTransferLimit"] = True
+                return Response(200, json=body)
+            if page == 1:
+                body = build_hpsa_response(["26163"])
+                body["features"][0]["attributes"].update(HPSA_SCORE=20, HPSA_ESTIMATED_UNDERSERVED_POP=5)
+                return Response(200, json=body)
+            return Response(200, json={"features": []})
+
+        with respx.mock:
+            respx.get(PC_HPSA_URL).mock(side_effect=_page)
+            rows = fetch_shortage_data(resolve_hpsa_measures(["primary_care_shortage"]))
+
+        assert rows == [{
+            "county": "Wayne",
+            "pc_hpsa_count": HPSA_PAGE_SIZE + 1,
+            "pc_hpsa_max_score": "20.0",
+            "pc_hpsa_avg_score": f"{(10 * HPSA_PAGE_SIZE + 20) / (HPSA_PAGE_SIZE + 1):.1f}",
+            "pc_underserved_pop": str(HPSA_PAGE_SIZE + 5),
+        }]
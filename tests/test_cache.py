@@ -0,0 +1,80 @@
+"""Tests for the on-disk API response cache."""
+
+from __future__ import annotations
+
+import os
+import time
+
+from acs_cli.cache import CACHE_TTL_SECONDS, cache_path, read_cached, write_cached
+from httpx import Response
+
+from acs_cli.census_api.client import fetch_acs_data
+from acs_cli.cms_api.client import HOSPITAL_BASE_URL, fetch_hospital_data
+from acs_cli.hrsa_api.client import fetch_hpsa_data
+from acs_cli.places_api import resolve_measures
+from acs_cli.places_api.client import fetch_places_data
+from acs_cli.topics import Variable
+from tests.conftest import MOCK_ACCESS_COUNTIES, PC_HPSA_URL, build_hospital_response, build_hpsa_response
+
+URL = "https://example.test/data"
+
+
+class TestResponseCache:
+    def test_round_trip(self):
+        write_cached(URL, {"a": 1}, b'{"ok": true}')
+        assert read_cached(URL, {"a": 1}) == b'{"ok": true}'
+
+    def test_miss_for_different_params(self):
+        write_cached(URL, {"a": 1}, b"[]")
+        assert read_cached(URL, {"a": 2}) is None
+
+    def test_api_key_not_part_of_key(self):
+        assert cache_path(URL, {"a": 1, "key": "one"}) == cache_path(URL, {"a": 1, "key": "two"})
+
+    def test_expired_entry_is_a_miss(self):
+        write_cached(URL, {}, b"[]")
+        stale = time.time() - CACHE_TTL_SECONDS - 60
+        os.utime(cache_path(URL, {}), (stale, stale))
+        assert read_cached(URL, {}) is None
+
+    def test_disabled_by_env(self, monkeypatch):
+        monkeypatch.setenv("ACS_CLI_NO_CACHE", "1")
+        write_cached(URL, {}, b"[]")
+        assert read_cached(URL, {}) is None
+        assert not cache_path(URL, {}).exists()
+
+    def test_repeat_acs_fetch_served_from_cache(self, mock_census):
+        route = mock_census(codes=["B01003_001E"])
+        variables = [Variable("B01003_001E", "Total Population", "number")]
+
+        first = fetch_acs_data(variables, 2024, "test-key-123")
+        second = fetch_acs_data(variables, 2024, "test-key-123")
+
+        assert route.call_count == 1
+        assert second == first
+
+    def test_repeat_places_fetch_served_from_cache(self, mock_places):
+        measures = resolve_measures(["chronic_disease"])
+        route = mock_places(measure_ids=[m.measureid for m in measures])
+
+        first = fetch_places_data(measures)
+        second = fetch_places_data(measures)
+
+        assert route.call_count == 1
+        assert second == first
+
+    def test_hpsa_error_payload_not_cached(self, respx_router):
+        error = Response(200, json={"error": {"code": 500, "message": "Unable to complete operation."}})
+        route = respx_router.get(PC_HPSA_URL).mock(side_effect=[error, Response(200, json=build_hpsa_response())])
+
+        assert fetch_hpsa_data("/9/query") == []
+        assert len(fetch_hpsa_data("/9/query")) == 3
+        assert route.call_count == 2
+
+    def test_hospital_error_payload_not_cached(self, respx_router):
+        error = Response(200, json={"error": "Service unavailable"})
+        route = respx_router.get(HOSPITAL_BASE_URL).mock(side_effect=[error, Response(200, json=build_hospital_response())])
+
+        assert fetch_hospital_data() == []
+        assert len(fetch_hospital_data()) == len(MOCK_ACCESS_COUNTIES)
+        assert route.call_count == 2
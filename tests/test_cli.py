@@ -2,53 +2,69 @@
 
 from __future__ import annotations
 
+import asyncio
 import csv
-import io
+import mmap
 
+import httpx
 import pytest
 import respx
 from httpx import Response
-from typer.testing import CliRunner
 
-from acs_cli.cli import app
 from acs_cli.census_api.client import (
+    ACS_BASE_URL,
+    MAX_CONCURRENT_REQUESTS,
+    ZCTA_FIELD,
+    _geo_keys,
+    _merge_columns,
+    parse_years,
     clean_county_name,
+    fetch_multi_year,
     format_value,
     resolve_variables,
 )
+from acs_cli.hrsa_api.client import MI_FIPS_TO_COUNTY
+from acs_cli.places_api import resolve_measures
 from acs_cli.topics import TOPICS
-from tests.conftest import MOCK_COUNTIES, MOCK_ZCTAS, build_census_response, build_zcta_census_response, census_url
-
-runner = CliRunner()
+from tests.conftest import MOCK_COUNTIES, MOCK_ZCTAS, assert_descending, build_census_response, build_zcta_census_response, census_url, count_lines, parse_csv, parse_csv_fast
+
+AGE_CODES = tuple(v.code for v in TOPICS["age"])
+POVERTY_CODES = tuple(v.code for v in TOPICS["poverty"])
+ALL_CODES = tuple(v.code for vs in TOPICS.values() for v in vs)
+TOPIC_NAMES = frozenset(TOPICS)
+TOTAL_VAR_COUNT = len(ALL_CODES)
+INFO_FETCHERS = (
+    "fetch_places_data",
+    "fetch_access_data",
+    "fetch_shortage_data",
+    "fetch_economy_data",
+    "fetch_qcew_data",
+    "fetch_ahrf_data",
+)
 
 
-def parse_csv(text: str) -> list[list[str]]:
-    return list(csv.reader(io.StringIO(text)))
+# ── topics command ───────────────────────────────────────────────────────────
 
 
-# ── topics command ───────────────────────────────────────────────────────────
+@pytest.fixture(scope="class")
+def topics_rows(runner, compiled_app) -> list[list[str]]:
+    result = runner.invoke(compiled_app, ["topics"])
+    assert result.exit_code == 0
+    return parse_csv_fast(result.stdout)
 
 
 class TestTopicsCommand:
-    def test_lists_all_topics(self):
-        result = runner.invoke(app, ["topics"])
-        assert result.exit_code == 0
-        rows = parse_csv(result.stdout)
-        header = rows[0]
+    def test_lists_all_topics(self, topics_rows):
+        header = topics_rows[0]
         assert header == ["Topic", "Variable Code", "Label", "Format"]
-        topic_names = {r[0] for r in rows[1:]}
-        assert topic_names == set(TOPICS.keys())
+        topic_names = {r[0] for r in topics_rows[1:]}
+        assert topic_names == TOPIC_NAMES
 
-    def test_row_count_matches_variables(self):
-        result = runner.invoke(app, ["topics"])
-        rows = parse_csv(result.stdout)
-        expected = sum(len(vs) for vs in TOPICS.values())
-        assert len(rows) - 1 == expected  # minus header
+    def test_row_count_matches_variables(self, topics_rows):
+        assert len(topics_rows) - 1 == TOTAL_VAR_COUNT  # minus header
 
-    def test_variable_codes_present(self):
-        result = runner.invoke(app, ["topics"])
-        rows = parse_csv(result.stdout)
-        codes = {r[1] for r in rows[1:]}
+    def test_variable_codes_present(self, topics_rows):
+        codes = {r[1] for r in topics_rows[1:]}
         assert "B01003_001E" in codes  # population total
         assert "B19013_001E" in codes  # median household income
 
@@ -57,28 +73,27 @@ class TestTopicsCommand:
 
 
 class TestQueryCommand:
-    def test_missing_api_key(self, no_api_key):
+    def test_missing_api_key(self, runner, compiled_app, no_api_key):
         with respx.mock:
-            result = runner.invoke(app, ["query", "population"])
+            result = runner.invoke(compiled_app, ["query", "population"])
         assert result.exit_code == 1
         assert "API key" in result.stderr or "CENSUS_API_KEY" in result.stderr
 
-    def test_no_topic_or_variable(self, api_key):
-        result = runner.invoke(app, ["query"])
+    def test_no_topic_or_variable(self, runner, compiled_app, api_key):
+        result = runner.invoke(compiled_app, ["query"])
         assert result.exit_code == 1
         assert "Provide topic" in result.stderr
 
-    def test_unknown_topic(self, api_key):
+    def test_unknown_topic(self, runner, compiled_app, api_key):
         with respx.mock:
-            result = runner.invoke(app, ["query", "nonexistent_topic"])
+            result = runner.invoke(compiled_app, ["query", "nonexistent_topic"])
         assert result.exit_code == 1
         assert "Unknown topic" in result.stderr
 
-    def test_single_topic(self, mock_census):
-        codes = [v.code for v in TOPICS["age"]]
-        mock_census(codes=codes)
+    def test_single_topic(self, runner, compiled_app, mock_census):
+        mock_census(codes=AGE_CODES)
 
-        result = runner.invoke(app, ["query", "age"])
+        result = runner.invoke(compiled_app, ["query", "age"])
         assert result.exit_code == 0
         rows = parse_csv(result.stdout)
         header = rows[0]
@@ -86,83 +101,74 @@ class TestQueryCommand:
         assert "Median Age" in header
         assert len(rows) == 1 + len(MOCK_COUNTIES)
 
-    def test_multiple_topics(self, mock_census):
-        codes = [v.code for v in TOPICS["age"]] + [v.code for v in TOPICS["poverty"]]
-        mock_census(codes=codes)
+    def test_multiple_topics(self, runner, compiled_app, mock_census):
+        mock_census(codes=AGE_CODES + POVERTY_CODES)
 
-        result = runner.invoke(app, ["query", "age", "poverty"])
+        result = runner.invoke(compiled_app, ["query", "age", "poverty"])
         assert result.exit_code == 0
         rows = parse_csv(result.stdout)
         header = rows[0]
         assert "Median Age" in header
         assert "Below Poverty Level" in header
 
-    def test_all_topics(self, mock_census):
-        codes = [v.code for topic_vars in TOPICS.values() for v in topic_vars]
-        mock_census(codes=codes)
+    def test_all_topics(self, runner, compiled_app, mock_census):
+        mock_census(codes=ALL_CODES)
 
-        result = runner.invoke(app, ["query", "all"])
+        result = runner.invoke(compiled_app, ["query", "all"])
         assert result.exit_code == 0
         rows = parse_csv(result.stdout)
         assert len(rows) > 1
 
-    def test_raw_variable(self, mock_census):
+    def test_raw_variable(self, runner, compiled_app, mock_census):
         mock_census(codes=["B01003_001E"])
 
-        result = runner.invoke(app, ["query", "--variable", "B01003_001E"])
+        result = runner.invoke(compiled_app, ["query", "--variable", "B01003_001E"])
         assert result.exit_code == 0
 
-    def test_county_filter(self, mock_census):
-        codes = [v.code for v in TOPICS["age"]]
-        mock_census(codes=codes)
+    def test_county_filter(self, runner, compiled_app, mock_census):
+        mock_census(codes=AGE_CODES)
 
-        result = runner.invoke(app, ["query", "age", "--county", "Washtenaw"])
+        result = runner.invoke(compiled_app, ["query", "age", "--county", "Washtenaw"])
         assert result.exit_code == 0
         rows = parse_csv(result.stdout)
         assert len(rows) == 2  # header + 1 matching county
         assert "Washtenaw" in rows[1][0]
 
-    def test_county_filter_no_match(self, mock_census):
-        codes = [v.code for v in TOPICS["age"]]
-        mock_census(codes=codes)
+    def test_county_filter_no_match(self, runner, compiled_app, mock_census):
+        mock_census(codes=AGE_CODES)
 
-        result = runner.invoke(app, ["query", "age", "--county", "Nonexistent"])
+        result = runner.invoke(compiled_app, ["query", "age", "--county", "Nonexistent"])
         assert "No matching rows" in result.stderr
 
-    def test_sort_option(self, mock_census):
-        codes = [v.code for v in TOPICS["age"]]
+    def test_sort_option(self, runner, compiled_app, mock_census):
         counter = {"n": 0}
 
         def values_fn(ci, _code):
             counter["n"] += 1
             return str(counter["n"] * 10)
 
-        resp = build_census_response(codes, values_fn=values_fn)
-        mock_census(codes=codes, response=resp)
+        resp = build_census_response(AGE_CODES, values_fn=values_fn)
+        mock_census(codes=AGE_CODES, response=resp)
 
-        result = runner.invoke(app, ["query", "age", "--sort", "Median Age"])
+        result = runner.invoke(compiled_app, ["query", "age", "--sort", "Median Age"])
         assert result.exit_code == 0
         rows = parse_csv(result.stdout)
         # Sorted descending by the Median Age column (index 1)
-        ages = [r[1] for r in rows[1:]]
-        ages_float = [float(a) for a in ages if a]
-        assert ages_float == sorted(ages_float, reverse=True)
+        assert_descending(rows, 1)
 
-    def test_year_option(self, mock_census):
-        codes = [v.code for v in TOPICS["age"]]
-        mock_census(year=2019, codes=codes)
+    def test_year_option(self, runner, compiled_app, mock_census):
+        mock_census(year=2019, codes=AGE_CODES)
 
-        result = runner.invoke(app, ["query", "age", "--year", "2019"])
+        result = runner.invoke(compiled_app, ["query", "age", "--year", "2019"])
         assert result.exit_code == 0
         rows = parse_csv(result.stdout)
         assert len(rows) == 1 + len(MOCK_COUNTIES)
 
-    def test_multi_year(self, mock_census):
-        codes = [v.code for v in TOPICS["age"]]
-        mock_census(year=2019, codes=codes)
-        mock_census(year=2023, codes=codes)
+    def test_multi_year(self, runner, compiled_app, mock_census):
+        mock_census(year=2019, codes=AGE_CODES)
+        mock_census(year=2023, codes=AGE_CODES)
 
-        result = runner.invoke(app, ["query", "age", "--years", "2019,2023"])
+        result = runner.invoke(compiled_app, ["query", "age", "--years", "2019,2023"])
         assert result.exit_code == 0
         rows = parse_csv(result.stdout)
         header = rows[0]
@@ -171,33 +177,77 @@ class TestQueryCommand:
         # 3 counties x 2 years = 6 data rows
         assert len(rows) == 1 + len(MOCK_COUNTIES) * 2
 
-    def test_output_to_file(self, mock_census, tmp_path):
-        codes = [v.code for v in TOPICS["age"]]
-        mock_census(codes=codes)
+    def test_multi_year_bounds_in_flight_requests(self):
+        in_flight = peak = 0
+        body = build_census_response(list(AGE_CODES))
+
+        async def _slow(request):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return Response(200, json=body)
+
+        years = tuple(range(2009, 2025))
+        variables = resolve_variables(["age"], None)
+        with respx.mock:
+            route = respx.get(url__regex=ACS_BASE_URL.format(year=r"\d+")).mock(side_effect=_slow)
+            table = fetch_multi_year(variables, years, "test-key-123")
+        assert route.call_count == len(years)
+        assert peak == MAX_CONCURRENT_REQUESTS
+        assert len(table["NAME"]) == len(MOCK_COUNTIES) * len(years)
+
+    def test_multi_year_rejects_out_of_range(self, runner, compiled_app, api_key):
+        result = runner.invoke(compiled_app, ["query", "age", "--years", "2005,2023"])
+        assert result.exit_code == 1
+        assert "between" in result.stderr
+
+    def test_multi_year_rejects_non_numeric(self, runner, compiled_app, api_key):
+        result = runner.invoke(compiled_app, ["query", "age", "--years", "2019,abc"])
+        assert result.exit_code == 1
+        assert "Invalid --years" in result.stderr
+
+    def test_output_to_file(self, runner, compiled_app, mock_census, tmp_path):
+        mock_census(codes=AGE_CODES)
 
-        outfile = str(tmp_path / "output.csv")
-        result = runner.invoke(app, ["query", "age", "--output", outfile])
+        outfile = tmp_path / "output.csv"
+        result = runner.invoke(compiled_app, ["query", "age", "--output", str(outfile)])
         assert result.exit_code == 0
         assert "Wrote CSV" in result.stderr
 
-        with open(outfile) as f:
-            rows = list(csv.reader(f))
-        assert rows[0][0] == "County"
-        assert len(rows) == 1 + len(MOCK_COUNTIES)
+        with open(outfile, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            assert mm[:7] == b"County,"
+            assert count_lines(mm) == 1 + len(MOCK_COUNTIES)
 
-    def test_api_error_status(self, api_key):
+    @pytest.mark.parametrize(
+        "status, body, message",
+        [(500, "Server Error", "500"), (401, "Unauthorized", "API key")],
+        ids=["server_error", "invalid_api_key"],
+    )
+    def test_api_error(self, runner, compiled_app, api_key, status, body, message):
         with respx.mock:
-            respx.get(census_url()).mock(return_value=Response(500, text="Server Error"))
-            result = runner.invoke(app, ["query", "age"])
+            respx.get(census_url()).mock(return_value=Response(status, text=body))
+            result = runner.invoke(compiled_app, ["query", "age"])
+        assert result.exit_code == 1
+        assert message in result.stderr
+
+    def test_multi_year_api_error(self, runner, compiled_app, mock_census, respx_router):
+        mock_census(year=2019, codes=AGE_CODES)
+        respx_router.get(census_url(2023)).mock(return_value=Response(500, text="Server Error"))
+
+        result = runner.invoke(compiled_app, ["query", "age", "--years", "2019,2023"])
         assert result.exit_code == 1
         assert "500" in result.stderr
 
-    def test_invalid_api_key(self, api_key):
+    @pytest.mark.parametrize("command", [["query", "age"], ["info", "Washtenaw"]])
+    def test_transport_error_exits_cleanly(self, runner, compiled_app, api_key, command):
         with respx.mock:
-            respx.get(census_url()).mock(return_value=Response(401, text="Unauthorized"))
-            result = runner.invoke(app, ["query", "age"])
+            respx.get(census_url()).mock(side_effect=httpx.ConnectTimeout("timed out"))
+            result = runner.invoke(compiled_app, command)
         assert result.exit_code == 1
-        assert "API key" in result.stderr
+        assert isinstance(result.exception, SystemExit)
+        assert "request failed: timed out" in result.stderr
 
 
 # ── zip query command ────────────────────────────────────────────────────
@@ -211,11 +261,10 @@ class TestZipQuery:
         monkeypatch.setattr("acs_cli.census_api.client.MI_ZCTAS", test_zctas)
         monkeypatch.setattr("acs_cli.census_api.zcta.MI_ZCTAS", test_zctas)
 
-    def test_zip_mode_basic(self, mock_census_zcta):
-        codes = [v.code for v in TOPICS["age"]]
-        mock_census_zcta(codes=codes)
+    def test_zip_mode_basic(self, runner, compiled_app, mock_census_zcta):
+        mock_census_zcta(codes=AGE_CODES)
 
-        result = runner.invoke(app, ["query", "age", "--zip"])
+        result = runner.invoke(compiled_app, ["query", "age", "--zip"])
         assert result.exit_code == 0
         rows = parse_csv(result.stdout)
         header = rows[0]
@@ -223,21 +272,19 @@ class TestZipQuery:
         assert "Median Age" in header
         assert len(rows) == 1 + len(MOCK_ZCTAS)
 
-    def test_zip_mode_sorted_by_zcta(self, mock_census_zcta):
-        codes = [v.code for v in TOPICS["age"]]
-        mock_census_zcta(codes=codes)
+    def test_zip_mode_sorted_by_zcta(self, runner, compiled_app, mock_census_zcta):
+        mock_census_zcta(codes=AGE_CODES)
 
-        result = runner.invoke(app, ["query", "age", "--zip"])
+        result = runner.invoke(compiled_app, ["query", "age", "--zip"])
         assert result.exit_code == 0
         rows = parse_csv(result.stdout)
         zcta_codes = [r[0] for r in rows[1:]]
         assert zcta_codes == sorted(zcta_codes)
 
-    def test_zip_filter(self, mock_census_zcta):
-        codes = [v.code for v in TOPICS["age"]]
-        mock_census_zcta(codes=codes)
+    def test_zip_filter(self, runner, compiled_app, mock_census_zcta):
+        mock_census_zcta(codes=AGE_CODES)
 
-        result = runner.invoke(app, ["query", "age", "--zip", "--county", "481"])
+        result = runner.invoke(compiled_app, ["query", "age", "--zip", "--county", "481"])
         assert result.exit_code == 0
         rows = parse_csv(result.stdout)
         # Only 48103 and 48104 match the "481" substring
@@ -245,37 +292,32 @@ class TestZipQuery:
         for r in rows[1:]:
             assert r[0].startswith("481")
 
-    def test_zip_filter_no_match(self, mock_census_zcta):
-        codes = [v.code for v in TOPICS["age"]]
-        mock_census_zcta(codes=codes)
+    def test_zip_filter_no_match(self, runner, compiled_app, mock_census_zcta):
+        mock_census_zcta(codes=AGE_CODES)
 
-        result = runner.invoke(app, ["query", "age", "--zip", "--county", "99999"])
+        result = runner.invoke(compiled_app, ["query", "age", "--zip", "--county", "99999"])
         assert "No matching rows" in result.stderr
 
-    def test_zip_sort_option(self, mock_census_zcta):
-        codes = [v.code for v in TOPICS["age"]]
+    def test_zip_sort_option(self, runner, compiled_app, mock_census_zcta):
         counter = {"n": 0}
 
         def values_fn(zi, _code):
             counter["n"] += 1
             return str(counter["n"] * 10)
 
-        resp = build_zcta_census_response(codes, values_fn=values_fn)
-        mock_census_zcta(codes=codes, response=resp)
+        resp = build_zcta_census_response(AGE_CODES, values_fn=values_fn)
+        mock_census_zcta(codes=AGE_CODES, response=resp)
 
-        result = runner.invoke(app, ["query", "age", "--zip", "--sort", "Median Age"])
+        result = runner.invoke(compiled_app, ["query", "age", "--zip", "--sort", "Median Age"])
         assert result.exit_code == 0
         rows = parse_csv(result.stdout)
-        ages = [r[1] for r in rows[1:]]
-        ages_float = [float(a) for a in ages if a]
-        assert ages_float == sorted(ages_float, reverse=True)
+        assert_descending(rows, 1)
 
-    def test_zip_multi_year(self, mock_census_zcta):
-        codes = [v.code for v in TOPICS["age"]]
-        mock_census_zcta(year=2019, codes=codes)
-        mock_census_zcta(year=2023, codes=codes)
+    def test_zip_multi_year(self, runner, compiled_app, mock_census_zcta):
+        mock_census_zcta(year=2019, codes=AGE_CODES)
+        mock_census_zcta(year=2023, codes=AGE_CODES)
 
-        result = runner.invoke(app, ["query", "age", "--zip", "--years", "2019,2023"])
+        result = runner.invoke(compiled_app, ["query", "age", "--zip", "--years", "2019,2023"])
         assert result.exit_code == 0
         rows = parse_csv(result.stdout)
         header = rows[0]
@@ -283,20 +325,19 @@ class TestZipQuery:
         assert header[1] == "Zip Code"
         assert len(rows) == 1 + len(MOCK_ZCTAS) * 2
 
-    def test_zip_raw_variable(self, mock_census_zcta):
+    def test_zip_raw_variable(self, runner, compiled_app, mock_census_zcta):
         mock_census_zcta(codes=["B01003_001E"])
 
-        result = runner.invoke(app, ["query", "--zip", "--variable", "B01003_001E"])
+        result = runner.invoke(compiled_app, ["query", "--zip", "--variable", "B01003_001E"])
         assert result.exit_code == 0
         rows = parse_csv(result.stdout)
         assert rows[0][0] == "Zip Code"
 
-    def test_zip_output_to_file(self, mock_census_zcta, tmp_path):
-        codes = [v.code for v in TOPICS["age"]]
-        mock_census_zcta(codes=codes)
+    def test_zip_output_to_file(self, runner, compiled_app, mock_census_zcta, tmp_path):
+        mock_census_zcta(codes=AGE_CODES)
 
         outfile = str(tmp_path / "zip_output.csv")
-        result = runner.invoke(app, ["query", "age", "--zip", "--output", outfile])
+        result = runner.invoke(compiled_app, ["query", "age", "--zip", "--output", outfile])
         assert result.exit_code == 0
         assert "Wrote CSV" in result.stderr
 
@@ -310,18 +351,16 @@ class TestZipQuery:
 
 
 class TestInfoCommand:
-    def test_missing_api_key(self, no_api_key):
+    def test_missing_api_key(self, runner, compiled_app, no_api_key):
         with respx.mock:
-            result = runner.invoke(app, ["info", "Washtenaw"])
+            result = runner.invoke(compiled_app, ["info", "Washtenaw"])
         assert result.exit_code == 1
         assert "API key" in result.stderr or "CENSUS_API_KEY" in result.stderr
 
-    def test_county_profile(self, mock_census):
-        all_vars = [v for vs in TOPICS.values() for v in vs]
-        codes = [v.code for v in all_vars]
-        mock_census(codes=codes)
+    def test_county_profile(self, runner, compiled_app, mock_census):
+        mock_census(codes=ALL_CODES)
 
-        result = runner.invoke(app, ["info", "Washtenaw"])
+        result = runner.invoke(compiled_app, ["info", "Washtenaw"])
         assert result.exit_code == 0
         rows = parse_csv(result.stdout)
         header = rows[0]
@@ -329,46 +368,98 @@ class TestInfoCommand:
         assert len(rows) >= 2
         assert "Washtenaw" in rows[1][0]
 
-    def test_county_not_found(self, mock_census):
-        all_vars = [v for vs in TOPICS.values() for v in vs]
-        codes = [v.code for v in all_vars]
-        mock_census(codes=codes)
+    def test_county_not_found(self, runner, compiled_app, mock_census):
+        mock_census(codes=ALL_CODES)
 
-        result = runner.invoke(app, ["info", "Nonexistent"])
+        result = runner.invoke(compiled_app, ["info", "Nonexistent"])
         assert result.exit_code == 1
         assert "No county matching" in result.stderr
 
-    def test_info_with_year(self, mock_census):
-        all_vars = [v for vs in TOPICS.values() for v in vs]
-        codes = [v.code for v in all_vars]
-        mock_census(year=2020, codes=codes)
+    def test_info_with_year(self, runner, compiled_app, mock_census):
+        mock_census(year=2020, codes=ALL_CODES)
 
-        result = runner.invoke(app, ["info", "Wayne", "--year", "2020"])
+        result = runner.invoke(compiled_app, ["info", "Wayne", "--year", "2020"])
         assert result.exit_code == 0
         rows = parse_csv(result.stdout)
         assert any("Wayne" in r[0] for r in rows[1:])
 
-    def test_info_case_insensitive(self, mock_census):
-        all_vars = [v for vs in TOPICS.values() for v in vs]
-        codes = [v.code for v in all_vars]
-        mock_census(codes=codes)
+    def test_info_case_insensitive(self, runner, compiled_app, mock_census):
+        mock_census(codes=ALL_CODES)
 
-        result = runner.invoke(app, ["info", "washtenaw"])
+        result = runner.invoke(compiled_app, ["info", "washtenaw"])
         assert result.exit_code == 0
         rows = parse_csv(result.stdout)
         assert any("Washtenaw" in r[0] for r in rows[1:])
 
+    def test_info_appends_places_for_matched_county(self, runner, compiled_app, mock_census, mock_places):
+        mock_census(codes=ALL_CODES)
+        mock_places(measure_ids=[m.measureid for m in resolve_measures(["all"])])
+
+        result = runner.invoke(compiled_app, ["info", "Washtenaw"])
+        assert result.exit_code == 0
+        rows = parse_csv(result.stdout)
+        places_rows = [r for r in rows[1:] if r[1].startswith("PLACES: ")]
+        assert len(places_rows) == len(resolve_measures(["all"]))
+        assert all(r[0] == "Washtenaw" for r in places_rows)
+
+    @pytest.mark.parametrize(
+        ("prefix", "fetch_name", "county_field", "id_attr", "spelling"),
+        [
+            ("PLACES", "fetch_places_data", "locationname", "measureid", "St. Joseph"),
+            ("Access", "fetch_access_data", "county", "measure_id", "St Joseph"),
+            ("Shortage", "fetch_shortage_data", "county", "measure_id", MI_FIPS_TO_COUNTY["26149"]),
+            ("Economy", "fetch_economy_data", "county", "measure_id", MI_FIPS_TO_COUNTY["26149"]),
+            ("QCEW", "fetch_qcew_data", "county", "measure_id", MI_FIPS_TO_COUNTY["26149"]),
+            ("Provider", "fetch_ahrf_data", "county", "measure_id", MI_FIPS_TO_COUNTY["26149"]),
+        ],
+    )
+    def test_info_matches_source_county_spelling(
+        self, runner, compiled_app, mock_census, bls_api_key, monkeypatch,
+        prefix, fetch_name, county_field, id_attr, spelling,
+    ):
+        mock_census(codes=ALL_CODES, counties=[("St. Joseph County, Michigan", "149"), *MOCK_COUNTIES])
+        for name in INFO_FETCHERS:
+            monkeypatch.setattr(f"acs_cli.cli.{name}", lambda measures, **_: [])
+
+        def _fetch(measures, **_):
+            return [{county_field: spelling, **{getattr(m, id_attr): "42" for m in measures}}]
+
+        monkeypatch.setattr(f"acs_cli.cli.{fetch_name}", _fetch)
+
+        result = runner.invoke(compiled_app, ["info", "Joseph"])
+        assert result.exit_code == 0
+        rows = parse_csv(result.stdout)
+        source_rows = [r for r in rows[1:] if r[1].startswith(f"{prefix}: ")]
+        assert source_rows
+        assert all(r[0] == "Saint Joseph" and r[2] == "42" for r in source_rows)
+
+    def test_info_gives_each_matched_county_its_own_row(self, runner, compiled_app, mock_census, monkeypatch):
+        # "st" matches both St. Clair and LivingSTon
+        mock_census(codes=ALL_CODES, counties=[("St. Clair County, Michigan", "147"), ("Livingston County, Michigan", "093")])
+        for name in INFO_FETCHERS:
+            monkeypatch.setattr(f"acs_cli.cli.{name}", lambda measures, **_: [])
+        monkeypatch.setattr(
+            "acs_cli.cli.fetch_access_data",
+            lambda measures, **_: [{"county": "Livingston", "hospital_count": 7}, {"county": "St Clair", "hospital_count": 2}],
+        )
+
+        result = runner.invoke(compiled_app, ["info", "st"])
+        assert result.exit_code == 0
+        rows = parse_csv(result.stdout)
+        counts = {r[0]: r[2] for r in rows[1:] if r[1] == "Access: Hospital Count"}
+        assert counts == {"Saint Clair": "2", "Livingston": "7"}
+
 
 # ── login command ────────────────────────────────────────────────────────────
 
 
 class TestLoginCommand:
-    def test_login_saves_key(self, tmp_path, monkeypatch):
+    def test_login_saves_key(self, runner, compiled_app, tmp_path, monkeypatch):
         config_file = tmp_path / "config"
         monkeypatch.setattr("acs_cli.census_api.client.CONFIG_DIR", tmp_path)
         monkeypatch.setattr("acs_cli.census_api.client.CONFIG_FILE", config_file)
 
-        result = runner.invoke(app, ["login", "--api-key", "my-secret-key"])
+        result = runner.invoke(compiled_app, ["login", "--api-key", "my-secret-key"])
         assert result.exit_code == 0
         assert "saved" in result.stderr.lower()
         assert config_file.read_text().strip() == "my-secret-key"
@@ -377,24 +468,37 @@ class TestLoginCommand:
 # ── Helper functions ─────────────────────────────────────────────────────────
 
 
+FORMAT_VALUE_CASES = (
+    ("12345", "number", "12345"),
+    ("12345", "dollar", "12345"),
+    ("3.7", "decimal", "3.7"),
+    ("45678.0", "number", "45678"),
+    ("-666666666", "number", ""),
+    ("-666666666.0", "dollar", ""),
+    ("null", "number", ""),
+    (None, "number", ""),
+    ("-", "dollar", ""),
+    ("None", "decimal", ""),
+    ("3.25", "percent", "3.25"),
+    ("N/A", "number", "N/A"),
+    ("1e3", "number", "1000"),
+    ("12a", "decimal", "12a"),
+)
+
+
 class TestFormatValue:
-    @pytest.mark.parametrize(
-        "value, fmt, expected",
-        [
-            ("12345", "number", "12345"),
-            ("12345", "dollar", "12345"),
-            ("3.7", "decimal", "3.7"),
-            ("45678.0", "number", "45678"),
-            ("-666666666", "number", ""),
-            ("-666666666.0", "dollar", ""),
-            ("null", "number", ""),
-            (None, "number", ""),
-            ("-", "dollar", ""),
-            ("None", "decimal", ""),
-        ],
-    )
-    def test_format_value(self, value, fmt, expected):
-        assert format_value(value, fmt) == expected
+    def test_format_value(self):
+        for value, fmt, expected in FORMAT_VALUE_CASES:
+            assert format_value(value, fmt) == expected, (value, fmt)
+
+
+class TestParseYears:
+    def test_sorted_and_deduplicated(self):
+        assert parse_years("2023, 2019,2023") == (2019, 2023)
+
+    def test_rejects_empty(self):
+        with pytest.raises(ValueError):
+            parse_years(" , ")
 
 
 class TestCleanCountyName:
@@ -421,8 +525,7 @@ class TestResolveVariables:
 
     def test_all_topics(self):
         result = resolve_variables(["all"], None)
-        expected = sum(len(vs) for vs in TOPICS.values())
-        assert len(result) == expected
+        assert len(result) == TOTAL_VAR_COUNT
 
     def test_raw_variables(self):
         result = resolve_variables([], ["B01003_001E", "B19013_001E"])
@@ -432,3 +535,36 @@ class TestResolveVariables:
     def test_unknown_topic_raises(self):
         with pytest.raises(ValueError, match="Unknown topic"):
             resolve_variables(["bogus"], None)
+
+
+class TestMergeColumns:
+    def test_aligns_batches_by_geography(self):
+        table: dict = {}
+        index: dict = {}
+        first = {"NAME": ["A", "B"], "X": ["1", "2"], "state": ["26", "26"], "county": ["001", "003"]}
+        second = {"NAME": ["B", "A"], "Y": ["20", "10"], "state": ["26", "26"], "county": ["003", "001"]}
+        _merge_columns(table, index, first, _geo_keys(first, False))
+        _merge_columns(table, index, second, _geo_keys(second, False))
+        assert table["NAME"] == ["A", "B"]
+        assert table["X"] == ["1", "2"]
+        assert table["Y"] == ["10", "20"]
+
+    def test_new_geographies_are_appended(self):
+        table: dict = {}
+        index: dict = {}
+        first = {"NAME": ["A"], "X": ["1"], ZCTA_FIELD: ["48103"]}
+        second = {"NAME": ["B"], "X": ["2"], ZCTA_FIELD: ["48104"]}
+        _merge_columns(table, index, first, _geo_keys(first, True))
+        _merge_columns(table, index, second, _geo_keys(second, True))
+        assert table[ZCTA_FIELD] == ["48103", "48104"]
+        assert table["X"] == ["1", "2"]
+
+    def test_aligned_batches_share_row_order(self):
+        table: dict = {}
+        index: dict = {}
+        first = {"NAME": ["A", "B"], "X": ["1", "2"], "state": ["26", "26"], "county": ["001", "003"]}
+        second = {"NAME": ["A", "B"], "Y": ["10", "20"], "state": ["26", "26"], "county": ["001", "003"]}
+        _merge_columns(table, index, first, _geo_keys(first, False))
+        _merge_columns(table, index, second, _geo_keys(second, False))
+        assert index == {"26001": 0, "26003": 1}
+        assert table["Y"] is second["Y"]
@@ -3,15 +3,12 @@
 from __future__ import annotations
 
 import csv
-import io
 from unittest.mock import ANY
 
 import pytest
 import respx
 from httpx import Response
-from typer.testing import CliRunner
 
-from acs_cli.cli import app
 from acs_cli.bls_api import (
     ECONOMY_MEASURES,
     QCEW_MEASURES,
@@ -30,23 +27,20 @@ from acs_cli.hrsa_api.client import MI_FIPS_TO_COUNTY
 from tests.conftest import (
     MOCK_BLS_FIPS,
     QCEW_BASE_URL_PATTERN,
+    assert_descending,
     build_bls_response,
     build_qcew_csv_response,
+    header_index,
+    parse_csv,
 )
 
-runner = CliRunner()
-
-
-def parse_csv(text: str) -> list[list[str]]:
-    return list(csv.reader(io.StringIO(text)))
-
 
 # ── economy-topics command ─────────────────────────────────────────────────
 
 
 class TestEconomyTopicsCommand:
-    def test_lists_all_groups(self):
-        result = runner.invoke(app, ["economy-topics"])
+    def test_lists_all_groups(self, runner, compiled_app):
+        result = runner.invoke(compiled_app, ["economy-topics"])
         assert result.exit_code == 0
         rows = parse_csv(result.stdout)
         header = rows[0]
@@ -54,14 +48,14 @@ class TestEconomyTopicsCommand:
         group_names = {r[0] for r in rows[1:]}
         assert group_names == set(ECONOMY_MEASURES.keys())
 
-    def test_row_count_matches_measures(self):
-        result = runner.invoke(app, ["economy-topics"])
+    def test_row_count_matches_measures(self, runner, compiled_app):
+        result = runner.invoke(compiled_app, ["economy-topics"])
         rows = parse_csv(result.stdout)
         expected = sum(len(ms) for ms in ECONOMY_MEASURES.values())
         assert len(rows) - 1 == expected
 
-    def test_measure_ids_present(self):
-        result = runner.invoke(app, ["economy-topics"])
+    def test_measure_ids_present(self, runner, compiled_app):
+        result = runner.invoke(compiled_app, ["economy-topics"])
         rows = parse_csv(result.stdout)
         ids = {r[1] for r in rows[1:]}
         assert "unemployment_rate" in ids
@@ -74,18 +68,18 @@ class TestEconomyTopicsCommand:
 
 
 class TestEconomyCommand:
-    def test_no_group_argument(self):
-        result = runner.invoke(app, ["economy"])
+    def test_no_group_argument(self, runner, compiled_app):
+        result = runner.invoke(compiled_app, ["economy"])
         assert result.exit_code == 1
         assert "Provide economy group" in result.stderr
 
-    def test_unknown_group(self):
+    def test_unknown_group(self, runner, compiled_app):
         with respx.mock:
-            result = runner.invoke(app, ["economy", "nonexistent_group"])
+            result = runner.invoke(compiled_app, ["economy", "nonexistent_group"])
         assert result.exit_code == 1
         assert "Unknown economy group" in result.stderr
 
-    def test_unemployment_group(self, mock_bls):
+    def test_unemployment_group(self, runner, compiled_app, mock_bls):
         # Build response with series IDs for all 83 counties × 2 unemployment measures
         all_series = []
         for fips in sorted(MI_FIPS_TO_COUNTY.keys()):
@@ -94,7 +88,7 @@ class TestEconomyCommand:
         resp = build_bls_response(series_ids=all_series, base_value=4.5)
         mock_bls(response=resp)
 
-        result = runner.invoke(app, ["economy", "unemployment"])
+        result = runner.invoke(compiled_app, ["economy", "unemployment"])
         assert result.exit_code == 0
         rows = parse_csv(result.stdout)
         header = rows[0]
@@ -103,7 +97,7 @@ class TestEconomyCommand:
         assert "Unemployment" in header
         assert len(rows) > 1
 
-    def test_all_groups(self, mock_bls):
+    def test_all_groups(self, runner, compiled_app, mock_bls):
         all_series = []
         for fips in sorted(MI_FIPS_TO_COUNTY.keys()):
             for code in ["03", "04", "05", "06"]:
@@ -111,7 +105,7 @@ class TestEconomyCommand:
         resp = build_bls_response(series_ids=all_series, base_value=3.0)
         mock_bls(response=resp)
 
-        result = runner.invoke(app, ["economy", "all"])
+        result = runner.invoke(compiled_app, ["economy", "all"])
         assert result.exit_code == 0
         rows = parse_csv(result.stdout)
         header = rows[0]
@@ -120,7 +114,7 @@ class TestEconomyCommand:
         assert "Labor Force" in header
         assert len(rows) > 1
 
-    def test_county_filter(self, mock_bls):
+    def test_county_filter(self, runner, compiled_app, mock_bls):
         all_series = []
         for fips in sorted(MI_FIPS_TO_COUNTY.keys()):
             for code in ["03", "04"]:
@@ -128,13 +122,13 @@ class TestEconomyCommand:
         resp = build_bls_response(series_ids=all_series, base_value=5.0)
         mock_bls(response=resp)
 
-        result = runner.invoke(app, ["economy", "unemployment", "--county", "Wayne"])
+        result = runner.invoke(compiled_app, ["economy", "unemployment", "--county", "Wayne"])
         assert result.exit_code == 0
         rows = parse_csv(result.stdout)
         assert len(rows) == 2  # header + 1 county
         assert "Wayne" in rows[1][0]
 
-    def test_sort_option(self, mock_bls):
+    def test_sort_option(self, runner, compiled_app, mock_bls):
         all_series = []
         for fips in sorted(MI_FIPS_TO_COUNTY.keys()):
             for code in ["03", "04"]:
@@ -162,16 +156,14 @@ class TestEconomyCommand:
         mock_bls(response=resp)
 
         result = runner.invoke(
-            app, ["economy", "unemployment", "--sort", "Unemployment Rate (%)"]
+            compiled_app, ["economy", "unemployment", "--sort", "Unemployment Rate (%)"]
         )
         assert result.exit_code == 0
         rows = parse_csv(result.stdout)
-        header = rows[0]
-        idx = header.index("Unemployment Rate (%)")
-        values = [float(r[idx]) for r in rows[1:] if r[idx]]
-        assert values == sorted(values, reverse=True)
+        idx = header_index(rows)["Unemployment Rate (%)"]
+        assert_descending(rows, idx)
 
-    def test_output_to_file(self, mock_bls, tmp_path):
+    def test_output_to_file(self, runner, compiled_app, mock_bls, tmp_path):
         all_series = []
         for fips in sorted(MI_FIPS_TO_COUNTY.keys()):
             for code in ["03", "04"]:
@@ -181,7 +173,7 @@ class TestEconomyCommand:
 
         outfile = str(tmp_path / "economy.csv")
         result = runner.invoke(
-            app, ["economy", "unemployment", "--output", outfile]
+            compiled_app, ["economy", "unemployment", "--output", outfile]
         )
         assert result.exit_code == 0
         assert "Wrote CSV" in result.stderr
@@ -190,22 +182,22 @@ class TestEconomyCommand:
         assert rows[0][0] == "County"
         assert len(rows) > 1
 
-    def test_api_error(self, bls_api_key):
+    def test_api_error(self, runner, compiled_app, bls_api_key):
         with respx.mock:
             respx.post(BLS_BASE_URL).mock(
                 return_value=Response(500, json={"status": "REQUEST_FAILED", "message": [], "Results": {"series": []}})
             )
-            result = runner.invoke(app, ["economy", "unemployment"])
+            result = runner.invoke(compiled_app, ["economy", "unemployment"])
         assert result.exit_code == 1
         assert "500" in result.stderr
 
-    def test_missing_key(self, monkeypatch, tmp_path):
+    def test_missing_key(self, runner, compiled_app, monkeypatch, tmp_path):
         monkeypatch.setenv("BLS_API_KEY", "")
         monkeypatch.setattr(
             "acs_cli.bls_api.client.BLS_CONFIG_FILE",
             tmp_path / "nonexistent_bls_config",
         )
-        result = runner.invoke(app, ["economy", "unemployment"])
+        result = runner.invoke(compiled_app, ["economy", "unemployment"])
         assert result.exit_code == 1
         assert "No BLS API key" in result.stderr
 
@@ -329,8 +321,8 @@ class TestBLSClient:
 
 
 class TestQCEWTopicsCommand:
-    def test_lists_all_groups(self):
-        result = runner.invoke(app, ["qcew-topics"])
+    def test_lists_all_groups(self, runner, compiled_app):
+        result = runner.invoke(compiled_app, ["qcew-topics"])
         assert result.exit_code == 0
         rows = parse_csv(result.stdout)
         header = rows[0]
@@ -338,14 +330,14 @@ class TestQCEWTopicsCommand:
         group_names = {r[0] for r in rows[1:]}
         assert group_names == set(QCEW_MEASURES.keys())
 
-    def test_row_count_matches_measures(self):
-        result = runner.invoke(app, ["qcew-topics"])
+    def test_row_count_matches_measures(self, runner, compiled_app):
+        result = runner.invoke(compiled_app, ["qcew-topics"])
         rows = parse_csv(result.stdout)
         expected = sum(len(ms) for ms in QCEW_MEASURES.values())
         assert len(rows) - 1 == expected
 
-    def test_measure_ids_present(self):
-        result = runner.invoke(app, ["qcew-topics"])
+    def test_measure_ids_present(self, runner, compiled_app):
+        result = runner.invoke(compiled_app, ["qcew-topics"])
         rows = parse_csv(result.stdout)
         ids = {r[1] for r in rows[1:]}
         assert "qcew_avg_annual_pay" in ids
@@ -358,20 +350,20 @@ class TestQCEWTopicsCommand:
 
 
 class TestQCEWCommand:
-    def test_no_group_argument(self):
-        result = runner.invoke(app, ["qcew"])
+    def test_no_group_argument(self, runner, compiled_app):
+        result = runner.invoke(compiled_app, ["qcew"])
         assert result.exit_code == 1
         assert "Provide QCEW group" in result.stderr
 
-    def test_unknown_group(self):
+    def test_unknown_group(self, runner, compiled_app):
         with respx.mock:
-            result = runner.invoke(app, ["qcew", "nonexistent_group"])
+            result = runner.invoke(compiled_app, ["qcew", "nonexistent_group"])
         assert result.exit_code == 1
         assert "Unknown QCEW group" in result.stderr
 
-    def test_wages_group(self, mock_qcew):
+    def test_wages_group(self, runner, compiled_app, mock_qcew):
         mock_qcew()
-        result = runner.invoke(app, ["qcew", "wages"])
+        result = runner.invoke(compiled_app, ["qcew", "wages"])
         assert result.exit_code == 0
         rows = parse_csv(result.stdout)
         header = rows[0]
@@ -380,9 +372,9 @@ class TestQCEWCommand:
         assert "Establishments" in header
         assert len(rows) > 1
 
-    def test_all_groups(self, mock_qcew):
+    def test_all_groups(self, runner, compiled_app, mock_qcew):
         mock_qcew()
-        result = runner.invoke(app, ["qcew", "all"])
+        result = runner.invoke(compiled_app, ["qcew", "all"])
         assert result.exit_code == 0
         rows = parse_csv(result.stdout)
         header = rows[0]
@@ -391,9 +383,9 @@ class TestQCEWCommand:
         assert "HC Establishments" in header
         assert len(rows) > 1
 
-    def test_county_filter(self, mock_qcew):
+    def test_county_filter(self, runner, compiled_app, mock_qcew):
         mock_qcew()
-        result = runner.invoke(app, ["qcew", "wages", "--county", "Alcona"])
+        result = runner.invoke(compiled_app, ["qcew", "wages", "--county", "Alcona"])
         assert result.exit_code == 0
         rows = parse_csv(result.stdout)
         # header + 1 county
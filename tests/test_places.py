@@ -4,167 +4,174 @@ from __future__ import annotations
 
 import csv
 import io
+from itertools import product
 
 import pytest
 import respx
 from httpx import Response
-from typer.testing import CliRunner
 
-from acs_cli.cli import app
-from acs_cli.places_api import PLACES_MEASURES, resolve_measures
+from acs_cli.places_api import PLACES_MEASURES, resolve_measures, write_places_csv
 from acs_cli.places_api.client import (
     PLACES_BASE_URL,
+    Measure,
     PlacesAPIError,
     _pivot_rows,
     fetch_places_data,
 )
 from tests.conftest import (
+    JSON_HEADERS,
     MOCK_PLACES_COUNTIES,
+    assert_descending,
     build_places_response,
+    header_index,
+    parse_csv,
+    parse_csv_fast,
 )
 
-runner = CliRunner()
 
+# Keep PLACES tests together when distributed with pytest -n auto --dist loadgroup
+pytestmark = pytest.mark.xdist_group("places")
 
-def parse_csv(text: str) -> list[list[str]]:
-    return list(csv.reader(io.StringIO(text)))
+ALL_MEASURES = tuple(resolve_measures(["all"]))
+ALL_MIDS = tuple(m.measureid for m in ALL_MEASURES)
+PLACES_MEASURE_IDS = {g: tuple(m.measureid for m in ms) for g, ms in PLACES_MEASURES.items()}
+N_MOCK_COUNTIES = len(MOCK_PLACES_COUNTIES)
 
 
 # ── places-topics command ────────────────────────────────────────────────────
 
 
 class TestPlacesTopicsCommand:
-    def test_lists_all_groups(self):
-        result = runner.invoke(app, ["places-topics"])
+    def test_topics_invariants(self, runner, compiled_app, subtests):
+        result = runner.invoke(compiled_app, ["places-topics"])
         assert result.exit_code == 0
-        rows = parse_csv(result.stdout)
-        header = rows[0]
-        assert header == ["Group", "Measure ID", "Label", "Short Question"]
-        group_names = {r[0] for r in rows[1:]}
-        assert group_names == set(PLACES_MEASURES.keys())
-
-    def test_row_count_matches_measures(self):
-        result = runner.invoke(app, ["places-topics"])
-        rows = parse_csv(result.stdout)
-        expected = sum(len(ms) for ms in PLACES_MEASURES.values())
-        assert len(rows) - 1 == expected
+        rows = parse_csv_fast(result.stdout)
 
-    def test_measure_ids_present(self):
-        result = runner.invoke(app, ["places-topics"])
-        rows = parse_csv(result.stdout)
-        ids = {r[1] for r in rows[1:]}
-        assert "DIABETES" in ids
-        assert "COPD" in ids
-        assert "BINGE" in ids
+        with subtests.test("header"):
+            assert rows[0] == ["Group", "Measure ID", "Label", "Short Question"]
+        with subtests.test("groups"):
+            assert {r[0] for r in rows[1:]} == set(PLACES_MEASURES.keys())
+        with subtests.test("row_count"):
+            assert len(rows) - 1 == len(ALL_MEASURES)
+        with subtests.test("measure_ids"):
+            ids = {r[1] for r in rows[1:]}
+            assert {"DIABETES", "COPD", "BINGE"} <= ids
 
 
 # ── places command ───────────────────────────────────────────────────────────
 
 
-class TestPlacesCommand:
-    def test_no_group_argument(self):
-        result = runner.invoke(app, ["places"])
-        assert result.exit_code == 1
-        assert "Provide PLACES group" in result.stderr
+@pytest.fixture(scope="module")
+def health_behaviors():
+    return PLACES_MEASURES["health_behaviors"]
 
-    def test_unknown_group(self):
-        with respx.mock:
-            result = runner.invoke(app, ["places", "nonexistent_group"])
-        assert result.exit_code == 1
-        assert "Unknown PLACES group" in result.stderr
 
-    def test_single_group(self, mock_places):
-        measures = PLACES_MEASURES["health_behaviors"]
-        mids = [m.measureid for m in measures]
-        mock_places(measure_ids=mids)
+@pytest.fixture(scope="module")
+def chronic_disease():
+    return PLACES_MEASURES["chronic_disease"]
 
-        result = runner.invoke(app, ["places", "health_behaviors"])
-        assert result.exit_code == 0
-        rows = parse_csv(result.stdout)
-        header = rows[0]
-        assert header[0] == "County"
-        for m in measures:
-            assert m.label in header
-        assert len(rows) == 1 + len(MOCK_PLACES_COUNTIES)
 
-    def test_all_groups(self, mock_places):
-        all_measures = resolve_measures(["all"])
-        mids = [m.measureid for m in all_measures]
-        mock_places(measure_ids=mids)
+def assert_places_shape(rows, measures, n_counties=N_MOCK_COUNTIES) -> None:
+    """A County column, every measure label, and one row per county."""
+    header = rows[0]
+    assert header[0] == "County"
+    missing = {m.label for m in measures} - set(header)
+    assert not missing, missing
+    assert len(rows) == 1 + n_counties
 
-        result = runner.invoke(app, ["places", "all"])
-        assert result.exit_code == 0
-        rows = parse_csv(result.stdout)
-        assert len(rows) > 1
 
-    def test_county_filter(self, mock_places):
-        measures = PLACES_MEASURES["chronic_disease"]
-        mids = [m.measureid for m in measures]
-        mock_places(measure_ids=mids)
+def render_places(measures, **kwargs) -> list[list[str]]:
+    """Fetch PLACES rows and write them the way the places command does."""
+    buf = io.StringIO()
+    write_places_csv(fetch_places_data(measures), measures, csv.writer(buf), **kwargs)
+    return parse_csv(buf.getvalue())
 
-        result = runner.invoke(app, ["places", "chronic_disease", "--county", "Washtenaw"])
-        assert result.exit_code == 0
-        rows = parse_csv(result.stdout)
-        assert len(rows) == 2  # header + 1 county
-        assert "Washtenaw" in rows[1][0]
 
-    def test_county_filter_no_match(self, mock_places):
-        measures = PLACES_MEASURES["chronic_disease"]
-        mids = [m.measureid for m in measures]
-        mock_places(measure_ids=mids)
+class TestPlacesCommand:
+    def test_no_group_argument(self, runner, compiled_app):
+        result = runner.invoke(compiled_app, ["places"])
+        assert result.exit_code == 1
+        assert "Provide PLACES group" in result.stderr
 
-        result = runner.invoke(app, ["places", "chronic_disease", "--county", "Nonexistent"])
-        assert "No matching rows" in result.stderr
+    def test_unknown_group(self, runner, compiled_app):
+        with respx.mock:
+            result = runner.invoke(compiled_app, ["places", "nonexistent_group"])
+        assert result.exit_code == 1
+        assert "Unknown PLACES group" in result.stderr
 
-    def test_sort_option(self, mock_places):
-        measures = PLACES_MEASURES["health_behaviors"]
-        mids = [m.measureid for m in measures]
-        mock_places(measure_ids=mids)
+    @pytest.mark.parametrize("group", list(PLACES_MEASURES))
+    def test_group_runs(self, runner, compiled_app, mock_places, group):
+        measures = PLACES_MEASURES[group]
+        mock_places(measure_ids=PLACES_MEASURE_IDS[group])
 
-        result = runner.invoke(app, ["places", "health_behaviors", "--sort", "Binge Drinking"])
+        result = runner.invoke(compiled_app, ["places", group])
         assert result.exit_code == 0
-        rows = parse_csv(result.stdout)
-        # Find the Binge Drinking column index
-        header = rows[0]
-        binge_idx = header.index("Binge Drinking")
-        values = [float(r[binge_idx]) for r in rows[1:] if r[binge_idx]]
-        assert values == sorted(values, reverse=True)
+        assert_places_shape(parse_csv(result.stdout), measures)
 
-    def test_output_to_file(self, mock_places, tmp_path):
-        measures = PLACES_MEASURES["health_behaviors"]
-        mids = [m.measureid for m in measures]
-        mock_places(measure_ids=mids)
+    def test_output_to_file(self, runner, compiled_app, mock_places, health_behaviors, tmp_path):
+        mock_places(measure_ids=PLACES_MEASURE_IDS["health_behaviors"])
 
         outfile = str(tmp_path / "places.csv")
-        result = runner.invoke(app, ["places", "health_behaviors", "--output", outfile])
+        result = runner.invoke(compiled_app, ["places", "health_behaviors", "--output", outfile])
         assert result.exit_code == 0
         assert "Wrote CSV" in result.stderr
 
-        with open(outfile) as f:
-            rows = list(csv.reader(f))
-        assert rows[0][0] == "County"
-        assert len(rows) == 1 + len(MOCK_PLACES_COUNTIES)
+        with open(outfile, newline="") as f:
+            assert_places_shape(list(csv.reader(f)), health_behaviors)
 
-    def test_prevalence_type_crude(self, mock_places):
-        measures = PLACES_MEASURES["health_behaviors"]
-        mids = [m.measureid for m in measures]
-        mock_places(measure_ids=mids, value_col="data_value")
+    def test_county_filter_no_match(self, runner, compiled_app, mock_places):
+        mock_places(measure_ids=PLACES_MEASURE_IDS["chronic_disease"])
 
-        result = runner.invoke(app, ["places", "health_behaviors", "--prevalence", "crude"])
+        result = runner.invoke(compiled_app, ["places", "chronic_disease", "--county", "Nonexistent"])
+        assert "No matching rows found." in result.stderr
+
+    def test_prevalence_type_crude(self, runner, compiled_app, mock_places):
+        mock_places(measure_ids=PLACES_MEASURE_IDS["health_behaviors"], value_col="data_value")
+
+        result = runner.invoke(compiled_app, ["places", "health_behaviors", "--prevalence", "crude"])
         assert result.exit_code == 0
         rows = parse_csv(result.stdout)
         assert len(rows) > 1
 
-    def test_api_error(self):
+    def test_api_error(self, runner, compiled_app):
         with respx.mock:
             respx.get(PLACES_BASE_URL).mock(
-                return_value=Response(500, json=[])
+                return_value=Response(500, content=b"[]", headers=JSON_HEADERS)
             )
-            result = runner.invoke(app, ["places", "chronic_disease"])
+            result = runner.invoke(compiled_app, ["places", "chronic_disease"])
         assert result.exit_code == 1
         assert "500" in result.stderr
 
 
+# ── PLACES CSV output ────────────────────────────────────────────────────────
+
+
+class TestPlacesOutput:
+    def test_all_groups(self, mock_places):
+        mock_places(measure_ids=ALL_MIDS)
+
+        assert_places_shape(render_places(list(ALL_MEASURES)), ALL_MEASURES)
+
+    def test_county_filter(self, mock_places, chronic_disease):
+        mock_places(measure_ids=PLACES_MEASURE_IDS["chronic_disease"])
+
+        rows = render_places(chronic_disease, county_filter="Washtenaw")
+        assert len(rows) == 2  # header + 1 county
+        assert "Washtenaw" in rows[1][0]
+
+    def test_county_filter_no_match(self, mock_places, chronic_disease):
+        mock_places(measure_ids=PLACES_MEASURE_IDS["chronic_disease"])
+
+        assert render_places(chronic_disease, county_filter="Nonexistent") == []
+
+    def test_sort_option(self, mock_places, health_behaviors):
+        mock_places(measure_ids=PLACES_MEASURE_IDS["health_behaviors"])
+
+        rows = render_places(health_behaviors, sort_col="Binge Drinking")
+        binge_idx = header_index(rows)["Binge Drinking"]
+        assert_descending(rows, binge_idx)
+
+
 # ── PLACES client unit tests ────────────────────────────────────────────────
 
 
@@ -174,26 +181,27 @@ class TestPlacesClient:
         assert len(result) == len(PLACES_MEASURES["chronic_disease"])
 
     def test_resolve_measures_all(self):
-        result = resolve_measures(["all"])
-        expected = sum(len(ms) for ms in PLACES_MEASURES.values())
-        assert len(result) == expected
+        assert ALL_MEASURES == tuple(m for ms in PLACES_MEASURES.values() for m in ms)
+
+    def test_resolve_measures_returns_fresh_list(self):
+        first = resolve_measures(["chronic_disease"])
+        first.clear()
+        assert len(resolve_measures(["chronic_disease"])) == len(PLACES_MEASURES["chronic_disease"])
 
     def test_resolve_measures_unknown_group(self):
         with pytest.raises(ValueError, match="Unknown PLACES group"):
             resolve_measures(["bogus"])
 
     def test_pivot_rows(self):
-        from acs_cli.places_api.client import Measure
-
         measures = [
             Measure("DIABETES", "Diabetes", "test"),
             Measure("COPD", "COPD", "test"),
         ]
+        locs = ["Wayne", "Oakland"]
+        values = ["12.3", "8.1", "10.5", "7.2"]  # county-major, measures in order
         records = [
-            {"locationname": "Wayne", "measureid": "DIABETES", "data_value": "12.3"},
-            {"locationname": "Wayne", "measureid": "COPD", "data_value": "8.1"},
-            {"locationname": "Oakland", "measureid": "DIABETES", "data_value": "10.5"},
-            {"locationname": "Oakland", "measureid": "COPD", "data_value": "7.2"},
+            {"locationname": loc, "measureid": mid, "data_value": v}
+            for (loc, mid), v in zip(product(locs, [m.measureid for m in measures]), values, strict=True)
         ]
         result = _pivot_rows(records, measures, "data_value")
         assert len(result) == 2
@@ -204,8 +212,6 @@ class TestPlacesClient:
         assert result[1]["COPD"] == "0.081"
 
     def test_pivot_rows_missing_data(self):
-        from acs_cli.places_api.client import Measure
-
         measures = [
             Measure("DIABETES", "Diabetes", "test"),
             Measure("COPD", "COPD", "test"),
@@ -219,9 +225,17 @@ class TestPlacesClient:
         assert result[0]["DIABETES"] == "0.123"
         assert "COPD" not in result[0]
 
-    def test_pivot_rows_normalizes_st(self):
-        from acs_cli.places_api.client import Measure
+    def test_pivot_rows_scales_numeric_values(self):
+        measures = [Measure("DIABETES", "Diabetes", "test")]
+        records = [
+            {"locationname": "Wayne", "measureid": "DIABETES", "data_value": 12.3},
+            {"locationname": "Oakland", "measureid": "DIABETES", "data_value": 8},
+        ]
+        oakland, wayne = _pivot_rows(records, measures, "data_value")
+        assert wayne["DIABETES"] == "0.123"
+        assert oakland["DIABETES"] == "0.08"
 
+    def test_pivot_rows_normalizes_st(self):
         measures = [Measure("DIABETES", "Diabetes", "test")]
         records = [
             {"locationname": "St. Clair", "measureid": "DIABETES", "data_value": "11.0"},
@@ -231,21 +245,18 @@ class TestPlacesClient:
         assert result[0]["locationname"] == "Saint Clair"
 
     def test_fetch_places_data_error(self):
+        measures = [Measure("DIABETES", "Diabetes", "test")]
         with respx.mock:
             respx.get(PLACES_BASE_URL).mock(
                 return_value=Response(500, text="Internal Server Error")
             )
             with pytest.raises(PlacesAPIError, match="500"):
-                from acs_cli.places_api.client import Measure
-                measures = [Measure("DIABETES", "Diabetes", "test")]
                 fetch_places_data(measures)
 
     def test_fetch_places_data_success(self, mock_places):
-        from acs_cli.places_api.client import Measure
-
         measures = [Measure("DIABETES", "Diabetes", "test")]
         mock_places(measure_ids=["DIABETES"])
         result = fetch_places_data(measures)
-        assert len(result) == len(MOCK_PLACES_COUNTIES)
+        assert len(result) == N_MOCK_COUNTIES
         assert all("locationname" in r for r in result)
         assert all("DIABETES" in r for r in result)
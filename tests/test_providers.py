@@ -2,40 +2,34 @@
 from __future__ import annotations
 
 import csv
-import io
 
 import pytest
-from typer.testing import CliRunner
 
-from acs_cli.cli import app
 from acs_cli.hrsa_api.ahrf import (
     AHRF_MEASURES,
     resolve_ahrf_measures,
     fetch_ahrf_data,
 )
 
-runner = CliRunner()
-
-
 # ── provider-topics command ─────────────────────────────────────────────────
 
 
 class TestProviderTopicsCommand:
-    def test_lists_groups(self):
-        result = runner.invoke(app, ["provider-topics"])
+    def test_lists_groups(self, runner, compiled_app):
+        result = runner.invoke(compiled_app, ["provider-topics"])
         assert result.exit_code == 0
         assert "physicians" in result.output
         assert "mid_level" in result.output
         assert "dental" in result.output
 
-    def test_row_count(self):
-        result = runner.invoke(app, ["provider-topics"])
+    def test_row_count(self, runner, compiled_app):
+        result = runner.invoke(compiled_app, ["provider-topics"])
         lines = result.output.strip().split("\n")
         # header + 6 measures
         assert len(lines) == 7
 
-    def test_measure_ids_present(self):
-        result = runner.invoke(app, ["provider-topics"])
+    def test_measure_ids_present(self, runner, compiled_app):
+        result = runner.invoke(compiled_app, ["provider-topics"])
         assert "ahrf_primary_care_physicians" in result.output
         assert "ahrf_nurse_practitioners" in result.output
         assert "ahrf_dentists" in result.output
@@ -45,18 +39,18 @@ class TestProviderTopicsCommand:
 
 
 class TestProvidersCommand:
-    def test_no_args_error(self):
-        result = runner.invoke(app, ["providers"])
+    def test_no_args_error(self, runner, compiled_app):
+        result = runner.invoke(compiled_app, ["providers"])
         assert result.exit_code == 1
         assert "Error" in result.output
 
-    def test_unknown_group_error(self, mock_ahrf):
-        result = runner.invoke(app, ["providers", "nonexistent"])
+    def test_unknown_group_error(self, runner, compiled_app, mock_ahrf):
+        result = runner.invoke(compiled_app, ["providers", "nonexistent"])
         assert result.exit_code == 1
         assert "Unknown AHRF group" in result.output
 
-    def test_physicians_group(self, mock_ahrf):
-        result = runner.invoke(app, ["providers", "physicians"])
+    def test_physicians_group(self, runner, compiled_app, mock_ahrf):
+        result = runner.invoke(compiled_app, ["providers", "physicians"])
         assert result.exit_code == 0
         assert "PC Physicians" in result.output
         assert "Total MDs" in result.output
@@ -64,8 +58,8 @@ class TestProvidersCommand:
         # Should have Michigan data
         assert "Washtenaw" in result.output
 
-    def test_all_groups(self, mock_ahrf):
-        result = runner.invoke(app, ["providers", "all"])
+    def test_all_groups(self, runner, compiled_app, mock_ahrf):
+        result = runner.invoke(compiled_app, ["providers", "all"])
         assert result.exit_code == 0
         # All measure labels should appear
         assert "PC Physicians" in result.output
@@ -73,12 +67,12 @@ class TestProvidersCommand:
         assert "PAs" in result.output
         assert "Dentists" in result.output
 
-    def test_county_filter(self, mock_ahrf):
-        result = runner.invoke(app, ["providers", "all", "--county", "Wayne"])
+    def test_county_filter(self, runner, compiled_app, mock_ahrf):
+        result = runner.invoke(compiled_app, ["providers", "all", "--county", "Wayne"])
         assert result.exit_code == 0
         assert "Wayne" in result.output
         # Other counties should be filtered out
-        reader = csv.reader(io.StringIO(result.output))
+        reader = csv.reader(result.output.splitlines())
         rows = list(reader)
         # header + 1 data row
         assert len(rows) == 2